@@ -4,6 +4,7 @@
 实现 DictionaryPort 接口的 MariaDB 适配器。
 """
 import logging
+from dataclasses import replace
 from datetime import datetime
 from typing import List, Optional
 
@@ -43,6 +44,8 @@ class DictionaryAdapter(DictionaryPort):
         返回:
             DictionaryEntry: 词典条目领域模型
         """
+        created_at = row[6] if row[6] is not None else datetime.now()
+        # 编辑者信息/编辑时间缺失时与创建者/创建时间一致
         return DictionaryEntry(
             id=row[0],
             project_id=row[1],
@@ -50,10 +53,10 @@ class DictionaryAdapter(DictionaryPort):
             definition=row[3],
             creator_id=row[4],
             creator_name=row[5],
-            created_at=row[6],
-            editor_id=row[7],
-            editor_name=row[8],
-            edited_at=row[9],
+            created_at=created_at,
+            editor_id=row[7] if row[7] is not None else row[4],
+            editor_name=row[8] if row[8] is not None else row[5],
+            edited_at=row[9] if row[9] is not None else created_at,
         )
 
     async def get_entries_by_project_id(self, project_id: int) -> List[DictionaryEntry]:
@@ -136,9 +139,12 @@ class DictionaryAdapter(DictionaryPort):
                         now,
                     )
                 )
-                entry.id = cursor.lastrowid
-                entry.created_at = now
-                entry.edited_at = now
+                entry = replace(
+                    entry,
+                    id=cursor.lastrowid,
+                    created_at=now,
+                    edited_at=now,
+                )
                 logger.info(f"创建词典条目成功: id={entry.id}, term={entry.term}")
                 return entry
 
@@ -167,7 +173,7 @@ class DictionaryAdapter(DictionaryPort):
                 )
                 if cursor.rowcount == 0:
                     raise ValueError(f"词典条目不存在: id={entry.id}")
-                entry.edited_at = now
+                entry = replace(entry, edited_at=now)
                 logger.info(f"更新词典条目成功: id={entry.id}")
                 return entry
 
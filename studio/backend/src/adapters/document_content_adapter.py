@@ -4,18 +4,21 @@
 实现 DocumentContentPort：文档内容以单 JSON 对象存储于 MariaDB。
 TipTap 文档中 paragraph 等节点可能只有 {"type": "paragraph"} 而无 "content"，
 应用 JSON Patch 时路径如 /content/12/content/0/text 会因缺少 content 报错，
-故在 patch 前对文档做规范化：为可含 content 的节点补上 content: []。
+为此提供 _ensure_tiptap_content 为可含 content 的节点补上 content: []；
+该规范化目前未启用（patch_content 中的调用处已注释），patch 前不会修改文档。
 """
-import copy
 import json
 import logging
-from datetime import datetime
-from typing import Any, List
+import re
+from typing import Any, List, Optional, Tuple
 
-import jsonpatch
+import aiomysql
+import orjson
 
 from src.ports.document_port import DocumentContentPort
 from src.infrastructure.database.mariadb import MariaDBPool
+from src.utils.json_patch import JsonPatchError, apply_patch, parse_pointer
+from src.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -24,27 +27,193 @@ _TIPTAP_NODES_WITH_CONTENT = frozenset({
     "doc", "paragraph", "heading", "bulletList", "orderedList", "listItem",
     "blockquote", "codeBlock", "codeBlockLeaf",
 })
-# 内联节点（paragraph/heading）缺 content 时补一个空 text，使 patch 路径如 /content/0/text 可生效
-_INLINE_DEFAULT_CONTENT = [{"type": "text", "text": ""}]
+# 缺 content 时补默认内联节点（空 text）的节点类型
+_INLINE_TYPES = frozenset({"paragraph", "heading"})
+
+# 19 位及以上的连续数字：可能是超出 64 位的整数（orjson 会将其静默解析为 float 而丢失精度）；
+# 小于 -2^63 的负数可能只有 19 位，故取 19 而非 20
+_WIDE_NUMBER_STR = re.compile(r"\d{19}")
+_WIDE_NUMBER_BYTES = re.compile(rb"\d{19}")
 
 
 def _ensure_tiptap_content(doc: Any) -> Any:
-    """递归为 TipTap 节点补全 content：缺则补 [] 或 paragraph/heading 补空 text，避免 JSON Patch 报错。"""
-    if doc is None:
-        return None
+    """
+    为 TipTap 节点补全 content：缺则补 [] 或 paragraph/heading 补空 text，避免 JSON Patch 报错。
+
+    使用显式栈迭代遍历（无逐节点递归），原地修改传入的文档（调用方需保证其为独立副本）。
+    目前没有任何请求路径调用此函数（patch_content 中的调用已注释），恢复调用前仅由单元测试覆盖。
+    """
     if not isinstance(doc, dict):
         return doc
-    out = copy.deepcopy(doc)
-    node_type = out.get("type") or ""
-    if node_type in _TIPTAP_NODES_WITH_CONTENT and "content" not in out:
-        # paragraph/heading 常被 patch 到 content/0/text，补默认内联节点
-        if node_type in ("paragraph", "heading"):
-            out["content"] = copy.deepcopy(_INLINE_DEFAULT_CONTENT)
+    with_content = _TIPTAP_NODES_WITH_CONTENT
+    inline_types = _INLINE_TYPES
+    stack = [doc]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        content = node.get("content")
+        if content is None:
+            # type 缺失时为 None，集合成员判断直接为 False，无需默认值分支
+            node_type = node.get("type")
+            if node_type in with_content and "content" not in node:
+                # paragraph/heading 常被 patch 到 content/0/text，补默认内联节点（空 text）
+                # 补上的 content 中没有需要再规范化的节点，无需入栈
+                if node_type in inline_types:
+                    node["content"] = [{"type": "text", "text": ""}]
+                else:
+                    node["content"] = []
+        elif isinstance(content, list):
+            for child in content:
+                if isinstance(child, dict):
+                    push(child)
+    return doc
+
+
+def _to_mariadb_path(tokens: Tuple[str, ...]) -> Optional[Tuple[str, List[str]]]:
+    """
+    将 JSON Pointer token 转为 MariaDB JSON 路径。
+
+    如 ("content", "0", "text") -> $."content"[0]."text"。
+
+    纯数字 token 按数组下标处理，并返回其所在容器的路径，供 SQL 侧校验该容器确为数组
+    （否则应按对象键处理，交由 Python 路径）。
+
+    返回:
+        Optional[Tuple[str, List[str]]]: (JSON 路径, 需为数组的容器路径列表)；
+        根路径或无法安全表达的 token（空键、含引号/反斜杠）返回 None
+    """
+    if not tokens:
+        return None
+    path = "$"
+    array_prefixes: List[str] = []
+    for token in tokens:
+        if token.isascii() and token.isdigit() and (len(token) == 1 or token[0] != "0"):
+            array_prefixes.append(path)
+            path = f"{path}[{token}]"
+        elif token and '"' not in token and "\\" not in token:
+            path = f'{path}."{token}"'
         else:
-            out["content"] = []
-    if "content" in out and isinstance(out["content"], list):
-        out["content"] = [_ensure_tiptap_content(c) for c in out["content"]]
-    return out
+            return None
+    return path, array_prefixes
+
+
+def _build_server_side_patch(patch_operations: List[dict]) -> Optional[Tuple[str, List[Any]]]:
+    """
+    尝试将 JSON Patch 翻译为单条 MariaDB UPDATE（JSON_REPLACE / JSON_REMOVE）。
+
+    仅覆盖语义可在服务端等价表达的情形：
+    - 任意个 replace，路径两两互不为前缀（应用顺序无关），value 不为 null；
+    - 单个 remove。
+    WHERE 中以 JSON_CONTAINS_PATH / JSON_TYPE 校验路径存在且下标所在容器为数组，
+    不满足时 UPDATE 不命中任何行，由调用方回退到 Python 路径（给出与 RFC 6902 一致的报错）。
+
+    返回:
+        Optional[Tuple[str, List[Any]]]: ("content = ... WHERE <校验条件>" SQL 片段, 参数)，
+        调用方追加 document_id 条件；不适用时返回 None
+    """
+    remove = len(patch_operations) == 1 and patch_operations[0].get("op") == "remove"
+    paths: List[str] = []
+    values: List[str] = []
+    array_prefixes: List[str] = []
+    tokens_list: List[Tuple[str, ...]] = []
+    for operation in patch_operations:
+        if not isinstance(operation, dict):
+            return None
+        if not remove:
+            # null 经 JSON_EXTRACT 可能变为 SQL NULL，整体置空文档，交由 Python 路径
+            if operation.get("op") != "replace" or operation.get("value") is None:
+                return None
+        try:
+            tokens = parse_pointer(operation.get("path"))
+        except JsonPatchError:
+            return None
+        converted = _to_mariadb_path(tokens)
+        if converted is None:
+            return None
+        path, prefixes = converted
+        paths.append(path)
+        array_prefixes.extend(prefixes)
+        tokens_list.append(tokens)
+        if not remove:
+            try:
+                # 以文本传参（二进制串作 JSON 函数参数时字符集不确定）
+                values.append(orjson.dumps(operation["value"]).decode())
+            except orjson.JSONEncodeError:
+                # 如超出 64 位的整数：交由 Python 路径给出明确的报错
+                return None
+
+    # 多个 replace 之间若存在前缀关系，结果依赖应用顺序，不走服务端
+    tokens_list.sort()
+    for shorter, longer in zip(tokens_list, tokens_list[1:]):
+        if longer[:len(shorter)] == shorter:
+            return None
+
+    params: List[Any] = []
+    if remove:
+        set_expr = "JSON_REMOVE(content, %s)"
+        params.extend(paths)
+    else:
+        set_expr = "JSON_REPLACE(content" + ", %s, JSON_EXTRACT(%s, '$')" * len(paths) + ")"
+        for path, value in zip(paths, values):
+            params.extend((path, value))
+    where = ["JSON_CONTAINS_PATH(content, 'all'" + ", %s" * len(paths) + ")"]
+    params.extend(paths)
+    for prefix in dict.fromkeys(array_prefixes):
+        where.append("JSON_TYPE(JSON_EXTRACT(content, %s)) = 'ARRAY'")
+        params.append(prefix)
+    return f"content = {set_expr} WHERE " + " AND ".join(where), params
+
+
+async def _select_content(
+    cursor: aiomysql.Cursor, document_id: int, for_update: bool = False
+) -> dict:
+    """在给定游标上查询并解析文档内容，未初始化时返回 {}；每次返回新解析的对象。"""
+    sql = "SELECT content FROM document_content WHERE document_id = %s"
+    await cursor.execute(sql + " FOR UPDATE" if for_update else sql, (document_id,))
+    row = await cursor.fetchone()
+    if row is None:
+        return {}
+    raw = row[0]
+    # 驱动返回的 dict / 解析结果均为本次查询独有，无需再拷贝
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    content: dict = _loads(raw)
+    return content
+
+
+def _loads(raw: Any) -> Any:
+    """
+    解析数据库中的 JSON 文本（str 或 bytes）。
+
+    orjson.loads 直接接受 str 或 bytes，省去解码与中间拷贝；但超出 64 位的整数会被解析为 float，
+    因此内容中出现 19 位以上的连续数字时改用 json.loads 以保留整数精度（误判仅多一次慢速解析）。
+    """
+    pattern = _WIDE_NUMBER_BYTES if isinstance(raw, bytes) else _WIDE_NUMBER_STR
+    if pattern.search(raw) is not None:
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
+async def _upsert_content(cursor: aiomysql.Cursor, document_id: int, content: dict) -> None:
+    """
+    在给定游标上写入文档内容（不存在则插入，存在则覆盖）。
+
+    orjson 直接输出 UTF-8 bytes（不转义非 ASCII），省去 str 编码步骤；
+    其无法序列化的内容（如超出 64 位的整数）回退到 json.dumps，保证仍可完整写入。
+    """
+    try:
+        serialized = orjson.dumps(content)
+    except orjson.JSONEncodeError:
+        serialized = json.dumps(content, ensure_ascii=False).encode()
+    await cursor.execute(
+        """INSERT INTO document_content (document_id, content, updated_at)
+           VALUES (%s, %s, NOW())
+           ON DUPLICATE KEY UPDATE content = VALUES(content), updated_at = VALUES(updated_at)""",
+        (document_id, serialized),
+    )
 
 
 class DocumentContentAdapter(DocumentContentPort):
@@ -52,42 +221,32 @@ class DocumentContentAdapter(DocumentContentPort):
     文档内容 MariaDB 适配器。
 
     表 document_content：document_id (PK), content (JSON), updated_at。
+    updated_at 由数据库 NOW() 生成，客户端不传时间戳。
+    同一文档的并发读取合并为一次查询与解析；写入后丢弃进行中的读取，保证之后的读取可见新内容。
     """
 
     def __init__(self, db_pool: MariaDBPool):
         self._db_pool = db_pool
+        self._content_reads = SingleFlight()
 
     async def get_content(self, document_id: int) -> dict:
-        """获取文档内容，未初始化时返回 {}。"""
+        """获取文档内容，未初始化时返回 {}。并发调用方共享同一结果对象，调用方不得修改。"""
+        return await self._content_reads.do(document_id, self._fetch_content, document_id)
+
+    async def _fetch_content(self, document_id: int) -> dict:
+        """查询并解析文档内容，每次调用均返回新解析的对象。"""
         pool = await self._db_pool.get_pool()
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                await cursor.execute(
-                    "SELECT content FROM document_content WHERE document_id = %s",
-                    (document_id,),
-                )
-                row = await cursor.fetchone()
-                if row is None:
-                    return {}
-                raw = row[0]
-                if isinstance(raw, dict):
-                    return copy.deepcopy(raw)
-                return copy.deepcopy(json.loads(raw)) if raw else {}
+                return await _select_content(cursor, document_id)
 
     async def set_content(self, document_id: int, content: dict) -> None:
         """设置文档内容（初始化或覆盖）。"""
         pool = await self._db_pool.get_pool()
         async with pool.acquire() as conn:
             async with conn.cursor() as cursor:
-                now = datetime.now()
-                payload = copy.deepcopy(content) if content is not None else {}
-                content_json = json.dumps(payload, ensure_ascii=False)
-                await cursor.execute(
-                    """INSERT INTO document_content (document_id, content, updated_at)
-                       VALUES (%s, %s, %s)
-                       ON DUPLICATE KEY UPDATE content = VALUES(content), updated_at = VALUES(updated_at)""",
-                    (document_id, content_json, now),
-                )
+                await _upsert_content(cursor, document_id, content if content is not None else {})
+        self._content_reads.forget(document_id)
         logger.info(f"set_content: document_id={document_id}")
 
     async def patch_content(
@@ -95,17 +254,70 @@ class DocumentContentAdapter(DocumentContentPort):
         document_id: int,
         patch_operations: List[dict],
     ) -> dict:
-        """对文档内容应用 JSON Patch 并持久化，返回新内容。"""
-        current = await self.get_content(document_id)
-        # 规范化：为 paragraph 等节点补上缺失的 content，避免 patch 路径如 /content/12/content/0/text 报 member 'content' not found
-        # current = _ensure_tiptap_content(current) if current else {}
-        try:
-            new_content = jsonpatch.apply_patch(current, patch_operations)
-        except jsonpatch.JsonPatchException as e:
-            raise ValueError(f"JSON Patch 应用失败: {e}") from e
-        if not isinstance(new_content, dict):
-            raise ValueError("Patch 结果必须为 JSON 对象")
-        await self.set_content(document_id, new_content)
+        """
+        对文档内容应用 JSON Patch 并持久化，返回新内容。
+
+        服务端路径与 Python 路径共用同一个连接：前者 UPDATE 后直接读回
+        （MariaDB 不支持 UPDATE ... RETURNING），后者在事务内 SELECT ... FOR UPDATE、
+        应用并写回，避免两次获取连接，也避免并发 patch 相互覆盖。
+        """
+        # 空 patch：无需应用与写回
+        if not patch_operations:
+            return await self.get_content(document_id)
+        # 整体替换（单个 replace/add 到根路径 ""）：无需读取、规范化与应用，直接写入
+        if len(patch_operations) == 1:
+            operation = patch_operations[0]
+            if (
+                operation.get("op") in ("replace", "add")
+                and operation.get("path") == ""
+                and "value" in operation
+            ):
+                new_content = operation["value"]
+                if not isinstance(new_content, dict):
+                    raise ValueError("Patch 结果必须为 JSON 对象")
+                await self.set_content(document_id, new_content)
+                return new_content
+
+        statement = _build_server_side_patch(patch_operations)
+        pool = await self._db_pool.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                if statement is not None:
+                    # 服务端路径：以 MariaDB JSON 函数原地修改，省去整文档的读取、应用与写回
+                    sql, params = statement
+                    await cursor.execute(
+                        "UPDATE document_content SET updated_at = NOW(), "
+                        f"{sql} AND document_id = %s",
+                        (*params, document_id),
+                    )
+                    # 未命中（文档不存在、路径校验不通过或值未变化，rowcount 为实际变更行数）时回退
+                    if cursor.rowcount:
+                        new_content = await _select_content(cursor, document_id)
+                        self._content_reads.forget(document_id)
+                        logger.info(f"patch_content(server-side): document_id={document_id}")
+                        return new_content
+
+                await conn.begin()
+                try:
+                    # 原地应用需独立副本，不复用合并读取的共享结果
+                    current = await _select_content(cursor, document_id, for_update=True)
+                    # 规范化（未启用）：为 paragraph 等节点补上缺失的 content，
+                    # 避免 patch 路径如 /content/12/content/0/text 报 member 'content' not found
+                    # current = _ensure_tiptap_content(current) if current else {}
+                    try:
+                        # current 为新解析的副本，原地应用即可，无需整树拷贝
+                        new_content = apply_patch(current, patch_operations)
+                    except JsonPatchError as e:
+                        raise ValueError(f"JSON Patch 应用失败: {e}") from e
+                    if not isinstance(new_content, dict):
+                        raise ValueError("Patch 结果必须为 JSON 对象")
+                    await _upsert_content(cursor, document_id, new_content)
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
+        self._content_reads.forget(document_id)
+        logger.info(f"patch_content: document_id={document_id}")
         return new_content
 
     async def delete_content(self, document_id: int) -> None:
@@ -117,5 +329,6 @@ class DocumentContentAdapter(DocumentContentPort):
                     "DELETE FROM document_content WHERE document_id = %s",
                     (document_id,),
                 )
+                self._content_reads.forget(document_id)
                 if cursor.rowcount:
                     logger.info(f"delete_content: document_id={document_id}")
@@ -5,38 +5,117 @@ Hydra 适配器
 负责与 Hydra OAuth2/OIDC 服务交互。
 与 hub 实现保持一致。
 """
+import hashlib
 import logging
+import time
+from typing import Dict, Optional
 
 import httpx
+import jwt
+import orjson
+from cachetools import TLRUCache, TTLCache
 
-from src.ports.hydra_port import HydraPort, IntrospectResponse
+from src.ports.hydra_port import HydraError, HydraPort, IntrospectResponse
 from src.infrastructure.config.settings import Settings
+from src.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Hydra Admin API 内省路径（相对于 hydra_host）
+_INTROSPECT_PATH = "/admin/oauth2/introspect"
+
+# JWKS 刷新最小间隔（秒）：遇到未知 kid 或拉取失败时，限制重新拉取频率
+_JWKS_MIN_REFRESH_INTERVAL = 60
+
+# 离线验证要求的声明：client_id / scp 仅出现在 Hydra 的访问令牌中，
+# 同一 JWKS 也用于签发 ID Token（含 sub / exp），缺少这两个声明的 JWT 不能作为访问令牌
+_ACCESS_TOKEN_CLAIMS = ["exp", "sub", "iss", "client_id", "scp"]
+
+
+def _token_key(token: str) -> bytes:
+    """
+    计算 token 的缓存键。
+
+    每次 introspect 只计算一次，缓存与并发合并共用同一 bytes 键；
+    BLAKE2b 比 SHA-256 更快，16 字节原始摘要也比 64 字符十六进制串更省内存、比较更快。
+
+    参数:
+        token: bearer token
+
+    返回:
+        bytes: 16 字节摘要
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 class HydraAdapter(HydraPort):
     """
     Hydra 服务适配器。
 
     使用 HTTP 客户端与 Hydra OAuth2/OIDC 服务交互。
+    内省结果在进程内按 token 摘要缓存（短 TTL），同一 token 在 TTL 内只请求一次 Hydra；
+    无效 token 另以更短的 TTL 负缓存。
+    启用离线验证时，JWT 访问令牌以缓存的 JWKS 公钥在本地校验，无需访问 Hydra。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            transport: 自定义 HTTP 传输层（如测试中的 httpx.MockTransport），默认使用连接池
         """
         self._settings = settings
         self._base_url = settings.hydra_host
         self._timeout = settings.hydra_timeout
+        # 复用同一客户端（连接池 + keep-alive），避免每次内省都重新建立 TCP/TLS 连接
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            transport=transport,
+            timeout=self._timeout,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+        # 内省缓存：key 为 token 的 16 字节 BLAKE2b 摘要（见 _token_key），
+        # 避免在内存中保留原始 bearer token
+        # 条目存活时间不超过 token 自身的 exp（按墙钟时间），过期 token 不会因缓存而继续被接受
+        self._introspect_cache: TLRUCache = TLRUCache(
+            maxsize=settings.hydra_introspect_cache_size,
+            ttu=self._active_ttu,
+            timer=time.time,
+        )
+        # 无效 token 负缓存：重复使用同一无效 token（客户端重试、撞库）时不再访问 Hydra
+        self._inactive_cache: TTLCache = TTLCache(
+            maxsize=settings.hydra_inactive_cache_size,
+            ttl=settings.hydra_inactive_cache_ttl,
+        )
+        # 同一 token 的并发未命中请求合并为一次 Hydra 调用
+        self._introspect_flight = SingleFlight()
+        # JWKS 公钥缓存：kid -> PyJWK
+        self._jwks: Dict[str, jwt.PyJWK] = {}
+        self._jwks_expires_at = 0.0
+        self._jwks_retry_at = 0.0
+
+    async def aclose(self) -> None:
+        """关闭 HTTP 客户端，释放连接池。"""
+        await self._client.aclose()
 
     async def introspect(self, token: str) -> IntrospectResponse:
         """
         内省 Token，验证 Token 是否有效并获取相关信息。
 
+        有效结果按 hydra_introspect_cache_ttl 缓存，无效结果按更短的 hydra_inactive_cache_ttl 缓存；
+        请求失败不缓存。
+
         参数:
             token: 访问令牌
 
@@ -44,26 +123,119 @@ class HydraAdapter(HydraPort):
             IntrospectResponse: 内省响应
 
         异常:
-            Exception: 当内省失败时抛出
+            HydraError: 当内省请求失败时抛出
         """
-        url = f"{self._base_url}/admin/oauth2/introspect"
+        key = _token_key(token)
+        cached: Optional[IntrospectResponse] = self._introspect_cache.get(key)
+        if cached is None:
+            cached = self._inactive_cache.get(key)
+        if cached is not None:
+            return cached
+
+        return await self._introspect_flight.do(key, self._introspect_and_cache, key, token)
+
+    def _active_ttu(self, _key: bytes, value: IntrospectResponse, now: float) -> float:
+        """有效内省结果的过期时刻：缓存 TTL 与 token exp 中较早者（exp <= now 时不会写入缓存）。"""
+        expires = now + self._settings.hydra_introspect_cache_ttl
+        if value.exp is not None:
+            return min(expires, value.exp)
+        return expires
+
+    async def _introspect_and_cache(self, key: bytes, token: str) -> IntrospectResponse:
+        """在线内省 token，并按结果写入有效/无效缓存。"""
+        result = await self._introspect_remote(token)
+        if result.active:
+            self._introspect_cache[key] = result
+        else:
+            self._inactive_cache[key] = result
+        return result
+
+    async def introspect_offline(self, token: str) -> Optional[IntrospectResponse]:
+        """
+        离线验证 JWT 访问令牌：以 JWKS 公钥校验签名，并校验 exp、iss 与访问令牌声明，不访问 Hydra。
 
-        data = {
-            "token": token,
-        }
+        参数:
+            token: 访问令牌
 
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
+        返回:
+            Optional[IntrospectResponse]: 校验通过时 active=True；签名无效、已过期、签发者不符
+            或不是访问令牌（如 ID Token）时 active=False；
+            未启用离线验证、token 非 JWT（不透明 token）或找不到对应公钥时返回 None
+        """
+        if not self._settings.hydra_offline_validation or token.count(".") != 2:
+            return None
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError:
+            return None
+        if not kid:
+            return None
+        signing_key = await self._get_signing_key(kid)
+        if signing_key is None:
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                key=signing_key.key,
+                algorithms=[signing_key.algorithm_name],
+                issuer=self._settings.hydra_issuer,
+                options={"require": _ACCESS_TOKEN_CLAIMS, "verify_aud": False},
             )
-            response.raise_for_status()
-
-            introspect_data = response.json()
+        except jwt.PyJWTError as e:
+            logger.debug("JWT 离线验证未通过: %s", e)
+            return IntrospectResponse(active=False)
+
+        ext = claims.get("ext")
+        visitor_typ = claims.get("visitor_typ")
+        if visitor_typ is None and isinstance(ext, dict):
+            visitor_typ = ext.get("visitor_typ")
+        return IntrospectResponse(
+            active=True,
+            visitor_id=claims.get("sub"),
+            visitor_typ=visitor_typ,
+            exp=claims.get("exp"),
+        )
+
+    async def _get_signing_key(self, kid: str) -> Optional[jwt.PyJWK]:
+        """
+        按 kid 获取 JWKS 公钥。
 
-            return IntrospectResponse(
-                active=introspect_data.get("active", False),
-                visitor_id=introspect_data.get("sub") or introspect_data.get("visitor_id"),
-                visitor_typ=introspect_data.get("visitor_typ"),
-            )
+        缓存过期或 kid 未知（密钥轮换）时重新拉取，两次拉取至少间隔 _JWKS_MIN_REFRESH_INTERVAL；
+        拉取失败时沿用已缓存的公钥。
+        """
+        now = time.monotonic()
+        stale = now >= self._jwks_expires_at or kid not in self._jwks
+        if stale and now >= self._jwks_retry_at:
+            self._jwks_retry_at = now + _JWKS_MIN_REFRESH_INTERVAL
+            try:
+                self._jwks = await self._load_jwks()
+                self._jwks_expires_at = time.monotonic() + self._settings.hydra_jwks_cache_ttl
+            except (httpx.HTTPError, ValueError, jwt.PyJWTError) as e:
+                logger.warning("获取 JWKS 失败: %s", e)
+        return self._jwks.get(kid)
+
+    async def _load_jwks(self) -> Dict[str, jwt.PyJWK]:
+        """拉取 JWKS 并解析为 kid -> PyJWK。"""
+        response = await self._client.get(self._settings.hydra_jwks_url)
+        response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(orjson.loads(response.content))
+        return {key.key_id: key for key in jwk_set.keys if key.key_id}
+
+    async def _introspect_remote(self, token: str) -> IntrospectResponse:
+        """调用 Hydra Admin API 内省 token。"""
+        try:
+            response = await self._client.post(_INTROSPECT_PATH, data={"token": token})
+            response.raise_for_status()
+            introspect_data = orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            raise HydraError(f"Token 内省请求失败: {e}") from e
+        if not isinstance(introspect_data, dict):
+            raise HydraError("Token 内省响应格式无效")
+
+        return IntrospectResponse(
+            active=introspect_data.get("active", False),
+            visitor_id=introspect_data.get("sub") or introspect_data.get("visitor_id"),
+            visitor_typ=introspect_data.get("visitor_typ"),
+            exp=introspect_data.get("exp"),
+        )
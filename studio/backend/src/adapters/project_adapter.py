@@ -4,6 +4,7 @@
 实现 ProjectPort 接口的 MariaDB 适配器。
 """
 import logging
+from dataclasses import replace
 from datetime import datetime
 from typing import List, Optional
 
@@ -43,16 +44,19 @@ class ProjectAdapter(ProjectPort):
         返回:
             Project: 项目领域模型
         """
+        creator_id = row[3] or ""
+        creator_name = row[4] or ""
+        # 编辑者信息/编辑时间缺失时与创建者/创建时间一致
         return Project(
             id=row[0],
             name=row[1],
             description=row[2],
-            creator_id=row[3] or "",
-            creator_name=row[4] or "",
+            creator_id=creator_id,
+            creator_name=creator_name,
             created_at=row[5],
-            editor_id=row[6] or "",
-            editor_name=row[7] or "",
-            edited_at=row[8],
+            editor_id=row[6] or creator_id,
+            editor_name=row[7] or creator_name,
+            edited_at=row[8] or row[5],
         )
 
     async def get_all_projects(self, creator_id: Optional[str] = None) -> List[Project]:
@@ -141,9 +145,12 @@ class ProjectAdapter(ProjectPort):
                         now,
                     )
                 )
-                project.id = cursor.lastrowid
-                project.created_at = now
-                project.edited_at = now
+                project = replace(
+                    project,
+                    id=cursor.lastrowid,
+                    created_at=now,
+                    edited_at=now,
+                )
                 logger.info(f"创建项目成功: id={project.id}, name={project.name}")
                 return project
 
@@ -173,7 +180,7 @@ class ProjectAdapter(ProjectPort):
                 if cursor.rowcount == 0:
                     raise ValueError(f"项目不存在: id={project.id}")
                 
-                project.edited_at = now
+                project = replace(project, edited_at=now)
                 logger.info(f"更新项目成功: id={project.id}")
                 return project
 
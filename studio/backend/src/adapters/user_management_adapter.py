@@ -5,36 +5,93 @@ User Management 适配器
 负责与用户管理服务交互。
 与 hub 实现保持一致。
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict
+from typing import Awaitable, Dict, List, Optional, Set
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
-from src.ports.user_management_port import UserManagementPort, UserInfo
+from src.ports.user_management_port import UserManagementError, UserManagementPort, UserInfo
 from src.infrastructure.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# 单次请求携带的最大用户 ID 数，避免 URL 超出服务端长度限制
+_BATCH_SIZE = 100
+
+# 请求的用户信息字段（GET /v1/users/{userIDsStr}/{fields}）
+_FIELDS = "account,name,csf_level,frozen,roles,email,telephone,third_attr,third_id,parent_deps"
+
+
+def _digest(info: dict) -> bytes:
+    """计算单个用户信息响应对象的稳定摘要（键排序后序列化），用于判断内容是否变化。"""
+    return hashlib.blake2b(orjson.dumps(info, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
 
 class UserManagementAdapter(UserManagementPort):
     """
     User Management 服务适配器。
 
     使用 HTTP 客户端与用户管理服务交互。
+    用户信息在进程内按用户 ID 缓存（短 TTL）；
+    对同一用户 ID 的并发未命中查询会合并为一次上游请求（single-flight），
+    不同用户 ID 的未命中查询在短暂的批处理窗口内汇总为一次批量请求。
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
         """
         初始化适配器。
 
         参数:
             settings: 应用配置
+            transport: 自定义 HTTP 传输层（如测试中的 httpx.MockTransport），默认使用连接池
         """
         self._settings = settings
         # 按照 hub/session 的实现方式，baseURL 包含 /api/user-management 前缀
         base_url = settings.user_management_url.rstrip("/")
         self._base_url = f"{base_url}/api/user-management"
         self._timeout = settings.user_management_timeout
+        # 复用同一客户端（连接池 + keep-alive），避免每次请求都重新建立连接
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            transport=transport,
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+        # 用户信息缓存：用户 ID -> UserInfo（不存在的用户不缓存）
+        self._user_cache: TTLCache = TTLCache(
+            maxsize=settings.user_management_cache_size,
+            ttl=settings.user_management_cache_ttl,
+        )
+        # 共享实例：(用户 ID, 上游响应摘要) -> UserInfo；用户缓存过期重新拉取后，
+        # 若上游返回内容未变化则复用原实例，而不是每次都构造新的 UserInfo
+        self._user_instances: TTLCache = TTLCache(
+            maxsize=settings.user_management_instance_cache_size,
+            ttl=settings.user_management_instance_ttl,
+        )
+        # 正在请求中的用户 ID -> 结果 Future（不存在的用户结果为 None）
+        self._inflight: Dict[str, "asyncio.Future[Optional[UserInfo]]"] = {}
+        # 持有后台请求任务的引用，防止任务在完成前被回收
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        # 批处理窗口（秒）内待请求的用户 ID，及负责在窗口结束时统一请求的任务
+        self._batch_window = settings.user_management_batch_window
+        self._batch: List[str] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    async def aclose(self) -> None:
+        """关闭 HTTP 客户端，释放连接池。"""
+        await self._client.aclose()
 
     async def batch_get_user_info_by_id(self, user_ids: list[str]) -> Dict[str, UserInfo]:
         """
@@ -47,58 +104,186 @@ class UserManagementAdapter(UserManagementPort):
             Dict[str, UserInfo]: 用户信息字典，key 为用户 ID
 
         异常:
-            Exception: 当获取失败时抛出
+            UserManagementError: 当获取失败时抛出
         """
         if not user_ids:
             return {}
 
+        # 去重（保持顺序），命中缓存的直接返回，其余与其他请求中正在查询的 ID 合并
+        user_info_dict: Dict[str, UserInfo] = {}
+        waiting: Dict[str, "asyncio.Future[Optional[UserInfo]]"] = {}
+        to_fetch: List[str] = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._user_cache.get(user_id)
+            if cached is not None:
+                user_info_dict[user_id] = cached
+            else:
+                waiting[user_id] = self._pending(user_id, to_fetch)
+        self._start_fetch(to_fetch)
+
+        for user_id, future in waiting.items():
+            # shield：单个调用方被取消时不影响共享同一结果的其他调用方
+            user_info = await asyncio.shield(future)
+            if user_info is not None:
+                user_info_dict[user_id] = user_info
+        return user_info_dict
+
+    async def get_user_info_by_id(self, user_id: str) -> Optional[UserInfo]:
+        """
+        获取单个用户信息，省去批量接口的列表/字典构造。
+
+        参数:
+            user_id: 用户 ID
+
+        返回:
+            Optional[UserInfo]: 用户信息，用户不存在时返回 None
+
+        异常:
+            UserManagementError: 当获取失败时抛出
+        """
+        cached: Optional[UserInfo] = self._user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        to_fetch: List[str] = []
+        future = self._pending(user_id, to_fetch)
+        self._start_fetch(to_fetch)
+        return await asyncio.shield(future)
+
+    def _pending(self, user_id: str, to_fetch: List[str]) -> "asyncio.Future[Optional[UserInfo]]":
+        """获取用户 ID 对应的 in-flight Future；尚无请求时新建并加入 to_fetch。"""
+        future = self._inflight.get(user_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[user_id] = future
+            to_fetch.append(user_id)
+        return future
+
+    def _start_fetch(self, to_fetch: List[str]) -> None:
+        """
+        安排请求 to_fetch 中的用户 ID。
+
+        启用批处理窗口时先加入待请求批次，由窗口结束时的一次批量请求统一获取；
+        未启用（窗口 <= 0）时立即在后台任务中请求。
+        """
+        if not to_fetch:
+            return
+        if self._batch_window <= 0:
+            self._spawn(self._fetch_and_resolve(to_fetch))
+            return
+        self._batch.extend(to_fetch)
+        if self._flush_task is None:
+            self._flush_task = self._spawn(self._flush_after_window())
+            self._flush_task.add_done_callback(self._on_flush_done)
+
+    def _spawn(self, coro: Awaitable[None]) -> "asyncio.Task[None]":
+        """创建后台任务并持有其引用直至完成。"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after_window(self) -> None:
+        """等待批处理窗口结束，然后一次性请求窗口内累积的全部用户 ID。"""
+        await asyncio.sleep(self._batch_window)
+        await self._fetch_and_resolve(self._take_batch())
+
+    def _on_flush_done(self, task: "asyncio.Task[None]") -> None:
+        """窗口任务在取出批次前被取消（如关闭时）：让批次内的等待方收到异常而不是一直挂起。"""
+        if self._flush_task is task and task.cancelled():
+            self._fail(self._take_batch(), asyncio.CancelledError())
+
+    def _take_batch(self) -> List[str]:
+        """取出当前窗口内待请求的用户 ID，并开启新窗口。"""
+        batch, self._batch = self._batch, []
+        self._flush_task = None
+        return batch
+
+    async def _fetch_and_resolve(self, user_ids: List[str]) -> None:
+        """分批并发请求用户信息，并完成对应的 in-flight Future。"""
+        try:
+            chunks = [
+                user_ids[i:i + _BATCH_SIZE] for i in range(0, len(user_ids), _BATCH_SIZE)
+            ]
+            results = await asyncio.gather(*(self._fetch_user_infos(c) for c in chunks))
+        except BaseException as e:
+            self._fail(user_ids, e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        fetched: Dict[str, UserInfo] = {}
+        for result in results:
+            fetched.update(result)
+        self._user_cache.update(fetched)
+        for user_id in user_ids:
+            future = self._inflight.pop(user_id)
+            if not future.done():
+                future.set_result(fetched.get(user_id))
+
+    def _fail(self, user_ids: List[str], error: BaseException) -> None:
+        """以异常完成对应的 in-flight Future。"""
+        for user_id in user_ids:
+            future = self._inflight.pop(user_id)
+            if not future.done():
+                future.set_exception(error)
+                # 异常会在各调用方 await 时抛出；此处标记为已读取，避免等待方提前退出时告警
+                future.exception()
+
+    async def _fetch_user_infos(self, user_ids: List[str]) -> Dict[str, UserInfo]:
+        """请求一批用户信息（单次 HTTP 调用）。"""
         # 按照 session 项目的实现方式：GET /v1/users/{userIDsStr}/{fields}
         user_ids_str = ",".join(user_ids)
-        fields = "account,name,csf_level,frozen,roles,email,telephone,third_attr,third_id,parent_deps"
-        url = f"{self._base_url}/v1/users/{user_ids_str}/{fields}"
-
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url)
+        try:
+            response = await self._client.get(f"/v1/users/{user_ids_str}/{_FIELDS}")
             response.raise_for_status()
-
             # 响应是一个数组，每个元素是一个用户信息对象
-            infos = response.json()
-            if not isinstance(infos, list):
-                infos = [infos]
-
-            user_info_dict = {}
-            for info in infos:
-                user_id = info.get("id", "")
-                if not user_id:
-                    continue
-
-                # 解析 roles（从数组转换为字典）
-                roles = {}
-                roles_list = info.get("roles", [])
-                if isinstance(roles_list, list):
-                    for role in roles_list:
-                        if isinstance(role, str):
-                            roles[role] = True
-
-                # 解析 parent_deps
-                parent_deps = info.get("parent_deps", [])
-                if not isinstance(parent_deps, list):
-                    parent_deps = []
-
-                user_info_dict[user_id] = UserInfo(
-                    id=str(user_id),
-                    account=info.get("account", ""),
-                    vision_name=info.get("name", ""),  # API 返回的是 "name" 字段
-                    csf_level=int(info.get("csf_level", 0)),
-                    frozen=bool(info.get("frozen", False)),
-                    roles=roles if roles else None,
-                    email=info.get("email"),
-                    telephone=info.get("telephone"),
-                    third_attr=info.get("third_attr"),
-                    third_id=info.get("third_id"),
-                    user_type=1,  # AccessorUser = 1
-                    groups=None,  # 当前 API 不返回 groups
-                    parent_deps=parent_deps if parent_deps else None,
-                )
-
-            return user_info_dict
+            infos = orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            raise UserManagementError(f"获取用户信息失败: {e}") from e
+        if not isinstance(infos, list):
+            infos = [infos]
+
+        user_info_dict = {}
+        for info in infos:
+            user_id = info.get("id", "")
+            if not user_id:
+                continue
+
+            instance_key = (user_id, _digest(info))
+            shared = self._user_instances.get(instance_key)
+            if shared is not None:
+                user_info_dict[user_id] = shared
+                continue
+
+            # 解析 roles（从数组转换为字典）
+            roles = {}
+            roles_list = info.get("roles", [])
+            if isinstance(roles_list, list):
+                for role in roles_list:
+                    if isinstance(role, str):
+                        roles[role] = True
+
+            # 解析 parent_deps
+            parent_deps = info.get("parent_deps", [])
+            if not isinstance(parent_deps, list):
+                parent_deps = []
+
+            user_info = UserInfo(
+                id=str(user_id),
+                account=info.get("account", ""),
+                vision_name=info.get("name", ""),  # API 返回的是 "name" 字段
+                csf_level=int(info.get("csf_level", 0)),
+                frozen=bool(info.get("frozen", False)),
+                roles=roles if roles else None,
+                email=info.get("email"),
+                telephone=info.get("telephone"),
+                third_attr=info.get("third_attr"),
+                third_id=info.get("third_id"),
+                user_type=1,  # AccessorUser = 1
+                groups=None,  # 当前 API 不返回 groups
+                parent_deps=parent_deps if parent_deps else None,
+            )
+            self._user_instances[instance_key] = user_info
+            user_info_dict[user_id] = user_info
+
+        return user_info_dict
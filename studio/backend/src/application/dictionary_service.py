@@ -90,8 +90,7 @@ class DictionaryService:
         if self._project_port:
             await self._project_port.get_project_by_id(project_id)
         
-        entry = DictionaryEntry(
-            id=0,
+        entry = DictionaryEntry.create(
             project_id=project_id,
             term=term,
             definition=definition,
@@ -129,8 +128,8 @@ class DictionaryService:
         # 获取现有条目
         entry = await self._dictionary_port.get_entry_by_id(entry_id)
 
-        # 更新字段
-        entry.update(
+        # 更新字段（返回新实例）
+        entry = entry.update(
             term=term,
             definition=definition,
             editor_id=editor_id,
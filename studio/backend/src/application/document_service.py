@@ -7,11 +7,10 @@ import copy
 import logging
 from typing import Any, List, Optional
 
-import jsonpatch
-
 from src.domains.document import FunctionDocument, DocumentBlock, BlockType
 from src.ports.document_port import DocumentPort, DocumentBlockPort, DocumentContentPort
 from src.ports.node_port import NodePort
+from src.utils.json_patch import JsonPatchError, apply_patch
 
 logger = logging.getLogger(__name__)
 
@@ -147,10 +146,13 @@ class DocumentService:
         blocks = await self._document_block_port.get_blocks_by_document_id(document_id)
         doc = {"blocks": [_block_to_patch_doc(b) for b in blocks]}
         try:
-            patched = jsonpatch.apply_patch(doc, patch_operations)
-        except jsonpatch.JsonPatchException as e:
+            # doc 为新构建的结构（块内容已拷贝），可原地应用
+            patched = apply_patch(doc, patch_operations)
+        except JsonPatchError as e:
             raise ValueError(f"JSON Patch 应用失败: {e}") from e
 
+        if not isinstance(patched, dict):
+            raise ValueError("patch 结果必须为 JSON 对象")
         blocks_list = patched.get("blocks")
         if not isinstance(blocks_list, list):
             raise ValueError("patch 结果中 blocks 必须为数组")
@@ -104,8 +104,7 @@ class ProjectService:
         异常:
             ValueError: 当项目名称已存在或数据验证失败时抛出
         """
-        project = Project(
-            id=0,
+        project = Project.create(
             name=name,
             description=description,
             creator_id=creator_id,
@@ -142,8 +141,8 @@ class ProjectService:
         # 获取现有项目
         project = await self._project_port.get_project_by_id(project_id)
 
-        # 更新字段
-        project.update(
+        # 更新字段（返回新实例）
+        project = project.update(
             name=name,
             description=description,
             editor_id=editor_id,
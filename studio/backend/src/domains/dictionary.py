@@ -3,17 +3,21 @@
 
 定义项目词典相关的领域模型和实体。
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
+# 模块级引用，省去每次构造时的属性查找
+_now = datetime.now
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class DictionaryEntry:
     """
-    项目词典条目领域模型。
+    项目词典条目领域模型（不可变）。
 
-    用于定义项目中的术语。
+    用于定义项目中的术语。新建条目请使用 DictionaryEntry.create()，
+    修改通过 update() 返回新实例。
     
     属性:
         id: 条目主键 ID
@@ -33,23 +37,48 @@ class DictionaryEntry:
     definition: str
     creator_id: Optional[str] = None
     creator_name: Optional[str] = None
-    created_at: Optional[datetime] = None
+    created_at: Optional[datetime] = field(default_factory=_now)
     editor_id: Optional[str] = None
     editor_name: Optional[str] = None
     edited_at: Optional[datetime] = None
 
-    def __post_init__(self):
-        """初始化后处理。"""
-        now = datetime.now()
-        if self.created_at is None:
-            self.created_at = now
-        if self.edited_at is None:
-            self.edited_at = self.created_at
-        # 如果未显式传入编辑者信息，则默认与创建者相同
-        if self.editor_id is None:
-            self.editor_id = self.creator_id
-        if self.editor_name is None:
-            self.editor_name = self.creator_name
+    @classmethod
+    def create(
+        cls,
+        project_id: int,
+        term: str,
+        definition: str,
+        creator_id: Optional[str] = None,
+        creator_name: Optional[str] = None,
+    ) -> "DictionaryEntry":
+        """
+        创建新词典条目实例（尚未持久化，id 为 0）。
+
+        编辑者默认与创建者相同，创建/编辑时间取当前时间。
+
+        参数:
+            project_id: 所属项目 ID
+            term: 术语名称
+            definition: 术语定义
+            creator_id: 创建者用户 ID（UUID 字符串）
+            creator_name: 创建者用户显示名
+
+        返回:
+            DictionaryEntry: 词典条目实例
+        """
+        now = _now()
+        return cls(
+            id=0,
+            project_id=project_id,
+            term=term,
+            definition=definition,
+            creator_id=creator_id,
+            creator_name=creator_name,
+            created_at=now,
+            editor_id=creator_id,
+            editor_name=creator_name,
+            edited_at=now,
+        )
 
     def validate(self) -> None:
         """
@@ -82,36 +111,17 @@ class DictionaryEntry:
             editor_name: 编辑者用户显示名
 
         返回:
-            DictionaryEntry: 更新后的词典条目实例
-        """
-        if term is not None:
-            self.term = term
-        if definition is not None:
-            self.definition = definition
-        if editor_id is not None:
-            self.editor_id = editor_id
-        if editor_name is not None:
-            self.editor_name = editor_name
-        # 每次更新都刷新编辑时间
-        self.edited_at = datetime.now()
-        return self
-
-    def to_dict(self) -> dict:
-        """
-        转换为字典。
-
-        返回:
-            dict: 词典条目字典
+            DictionaryEntry: 更新后的新词典条目实例（原实例不变）
         """
-        return {
-            "id": self.id,
-            "project_id": self.project_id,
-            "term": self.term,
-            "definition": self.definition,
-            "creator_id": self.creator_id,
-            "creator_name": self.creator_name,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "editor_id": self.editor_id,
-            "editor_name": self.editor_name,
-            "edited_at": self.edited_at.isoformat() if self.edited_at else None,
+        changes: Dict[str, Any] = {
+            key: value
+            for key, value in (
+                ("term", term),
+                ("definition", definition),
+                ("editor_id", editor_id),
+                ("editor_name", editor_name),
+            )
+            if value is not None
         }
+        # 每次更新都刷新编辑时间
+        return replace(self, **changes, edited_at=_now())
@@ -3,15 +3,20 @@
 
 定义项目相关的领域模型和实体。
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
+# 模块级引用，省去每次构造时的属性查找
+_now = datetime.now
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Project:
     """
-    项目领域模型。
+    项目领域模型（不可变）。
+
+    新建项目请使用 Project.create()，修改通过 update() 返回新实例。
 
     属性:
         id: 项目主键 ID
@@ -29,22 +34,45 @@ class Project:
     description: Optional[str] = None
     creator_id: str = ""
     creator_name: str = ""
-    created_at: Optional[datetime] = None
+    created_at: Optional[datetime] = field(default_factory=_now)
     editor_id: str = ""
     editor_name: str = ""
     edited_at: Optional[datetime] = None
 
-    def __post_init__(self):
-        """初始化后处理。"""
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.edited_at is None:
-            self.edited_at = self.created_at
-        # 如果未显式传入编辑者信息，则默认与创建者相同
-        if not self.editor_id:
-            self.editor_id = self.creator_id
-        if not self.editor_name:
-            self.editor_name = self.creator_name
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        description: Optional[str] = None,
+        creator_id: str = "",
+        creator_name: str = "",
+    ) -> "Project":
+        """
+        创建新项目实例（尚未持久化，id 为 0）。
+
+        编辑者默认与创建者相同，创建/编辑时间取当前时间。
+
+        参数:
+            name: 项目名称
+            description: 项目描述
+            creator_id: 创建者用户 ID（UUID 字符串）
+            creator_name: 创建者用户显示名
+
+        返回:
+            Project: 项目实例
+        """
+        now = _now()
+        return cls(
+            id=0,
+            name=name,
+            description=description,
+            creator_id=creator_id,
+            creator_name=creator_name,
+            created_at=now,
+            editor_id=creator_id,
+            editor_name=creator_name,
+            edited_at=now,
+        )
 
     def validate(self) -> None:
         """
@@ -75,15 +103,16 @@ class Project:
             editor_name: 编辑者用户显示名
 
         返回:
-            Project: 更新后的项目实例
+            Project: 更新后的新项目实例（原实例不变）
         """
-        if name is not None:
-            self.name = name
-        if description is not None:
-            self.description = description
-        if editor_id is not None:
-            self.editor_id = editor_id
-        if editor_name is not None:
-            self.editor_name = editor_name
-        self.edited_at = datetime.now()
-        return self
+        changes: Dict[str, Any] = {
+            key: value
+            for key, value in (
+                ("name", name),
+                ("description", description),
+                ("editor_id", editor_id),
+                ("editor_name", editor_name),
+            )
+            if value is not None
+        }
+        return replace(self, **changes, edited_at=_now())
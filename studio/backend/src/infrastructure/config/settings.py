@@ -67,6 +67,38 @@ class Settings(BaseSettings):
         description="Hydra 管理服务地址（Admin API）"
     )
     hydra_timeout: int = Field(default=30, description="Hydra 请求超时时间（秒）")
+    hydra_introspect_cache_ttl: int = Field(
+        default=30,
+        description="Token 内省结果缓存时间（秒），仅缓存有效 token，应远小于 token 有效期"
+    )
+    hydra_introspect_cache_size: int = Field(
+        default=10000,
+        description="Token 内省结果缓存最大条目数"
+    )
+    hydra_inactive_cache_ttl: int = Field(
+        default=10,
+        description="无效 token 内省结果缓存时间（秒），短于有效 token 缓存以限制过期判定的滞后"
+    )
+    hydra_inactive_cache_size: int = Field(
+        default=50000,
+        description="无效 token 内省结果缓存最大条目数"
+    )
+    hydra_offline_validation: bool = Field(
+        default=False,
+        description="是否启用 JWT 访问令牌离线验证（本地校验签名，不透明 token 仍走在线内省）"
+    )
+    hydra_jwks_url: str = Field(
+        default="http://localhost:4444/.well-known/jwks.json",
+        description="Hydra JWKS 公钥地址（离线验证使用）"
+    )
+    hydra_issuer: str = Field(
+        default="http://localhost:4444/",
+        description="Hydra 签发者（离线验证时 JWT 的 iss 必须与之一致）"
+    )
+    hydra_jwks_cache_ttl: int = Field(
+        default=3600,
+        description="JWKS 公钥缓存时间（秒）"
+    )
 
     # User Management 服务配置（与 hub 一致，用于根据用户 ID 获取用户信息）
     user_management_url: str = Field(
@@ -77,6 +109,37 @@ class Settings(BaseSettings):
         default=60,
         description="User Management 请求超时时间（秒）"
     )
+    user_management_cache_ttl: int = Field(
+        default=30,
+        description="用户信息缓存时间（秒），仅缓存存在的用户"
+    )
+    user_management_cache_size: int = Field(
+        default=10000,
+        description="用户信息缓存最大条目数"
+    )
+    user_management_instance_ttl: int = Field(
+        default=600,
+        description="用户信息实例复用时间（秒）：上游返回内容未变化时复用同一 UserInfo 实例"
+    )
+    user_management_instance_cache_size: int = Field(
+        default=10000,
+        description="可复用的 UserInfo 实例最大条目数"
+    )
+    user_management_batch_window: float = Field(
+        default=0.005,
+        description="用户信息批处理窗口（秒），窗口内的并发查询合并为一次批量请求；<= 0 表示不等待"
+    )
+
+    # 外部服务 HTTP 连接池配置（Hydra / User Management 客户端各自一个连接池）
+    http_max_connections: int = Field(default=1000, description="单个 HTTP 客户端最大连接数")
+    http_max_keepalive_connections: int = Field(
+        default=200,
+        description="单个 HTTP 客户端最大空闲 keep-alive 连接数"
+    )
+    http_keepalive_expiry: float = Field(
+        default=300,
+        description="空闲 keep-alive 连接保留时间（秒）"
+    )
     
     # 临时文件配置
     temp_dir: str = Field(default="/tmp/dip-studio", description="临时文件目录")
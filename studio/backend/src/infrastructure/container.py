@@ -209,8 +209,12 @@ class Container:
         """
         关闭容器，释放资源。
 
-        关闭数据库连接池等资源。
+        关闭数据库连接池、外部服务 HTTP 客户端等资源。
         """
+        if self._hydra_adapter is not None:
+            await self._hydra_adapter.aclose()
+        if self._user_management_adapter is not None:
+            await self._user_management_adapter.aclose()
         if self._mariadb_pool is not None:
             await self._mariadb_pool.close()
         logger.info("容器资源已释放")
@@ -4,18 +4,14 @@
 提供请求上下文管理功能，用于在请求处理过程中传递上下文信息。
 """
 from src.infrastructure.context.token_context import (
-    TokenContext,
     UserContext,
-    get_auth_token,
     get_user_info,
     get_user_id,
     get_user_name,
 )
 
 __all__ = [
-    "TokenContext",
     "UserContext",
-    "get_auth_token",
     "get_user_info",
     "get_user_id",
     "get_user_name",
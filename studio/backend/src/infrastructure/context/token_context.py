@@ -1,7 +1,7 @@
 """
-Token上下文管理器
+用户上下文管理器
 
-提供统一的token和用户信息获取方式，供适配器层使用。
+提供统一的用户信息获取方式，供应用层与路由层使用。
 通过contextvars实现请求级别的上下文管理。
 与 hub 一致：用户信息由认证中间件通过 Hydra 内省 + 用户管理服务获取并设置。
 """
@@ -10,53 +10,12 @@ from typing import Optional
 
 from src.ports.user_management_port import UserInfo
 
-# 创建上下文变量，用于存储当前请求的token
-_auth_token_context: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
-    'auth_token', default=None
-)
-
 # 创建上下文变量，用于存储当前请求的用户信息
 _user_info_context: contextvars.ContextVar[Optional[UserInfo]] = contextvars.ContextVar(
     'user_info', default=None
 )
 
 
-class TokenContext:
-    """
-    Token上下文管理器。
-    
-    用于在请求处理过程中设置和获取认证token。
-    适配器层可以通过此类统一获取token，而不需要从参数传递。
-    """
-    
-    @staticmethod
-    def set_token(token: Optional[str]) -> None:
-        """
-        设置当前上下文的认证token。
-        
-        参数:
-            token: 认证token，如果为None则清除token
-        """
-        _auth_token_context.set(token)
-    
-    @staticmethod
-    def get_token() -> Optional[str]:
-        """
-        获取当前上下文的认证token。
-        
-        返回:
-            Optional[str]: 认证token，如果未设置则返回None
-        """
-        return _auth_token_context.get(None)
-    
-    @staticmethod
-    def clear_token() -> None:
-        """
-        清除当前上下文的认证token。
-        """
-        _auth_token_context.set(None)
-
-
 class UserContext:
     """
     用户上下文管理器。
@@ -66,14 +25,27 @@ class UserContext:
     """
     
     @staticmethod
-    def set_user_info(user_info: Optional[UserInfo]) -> None:
+    def set_user_info(user_info: Optional[UserInfo]) -> contextvars.Token:
         """
         设置当前上下文的用户信息。
         
         参数:
             user_info: 用户信息，如果为None则清除用户信息
+
+        返回:
+            contextvars.Token: 用于 reset_user_info() 恢复设置前的值
+        """
+        return _user_info_context.set(user_info)
+
+    @staticmethod
+    def reset_user_info(token: contextvars.Token) -> None:
+        """
+        将用户信息恢复为 set_user_info() 之前的值。
+
+        参数:
+            token: set_user_info() 返回的 Token
         """
-        _user_info_context.set(user_info)
+        _user_info_context.reset(token)
     
     @staticmethod
     def get_user_info() -> Optional[UserInfo]:
@@ -84,23 +56,6 @@ class UserContext:
             Optional[UserInfo]: 用户信息，如果未设置则返回None
         """
         return _user_info_context.get(None)
-    
-    @staticmethod
-    def clear_user_info() -> None:
-        """
-        清除当前上下文的用户信息。
-        """
-        _user_info_context.set(None)
-
-
-def get_auth_token() -> Optional[str]:
-    """
-    便捷函数：获取当前上下文的认证token。
-    
-    返回:
-        Optional[str]: 认证token，如果未设置则返回None
-    """
-    return TokenContext.get_token()
 
 
 def get_user_info() -> Optional[UserInfo]:
@@ -5,7 +5,7 @@
 严格参考 hub/backend 的 src/infrastructure/database/init.py 实现。
 """
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import aiomysql
 
@@ -13,6 +13,143 @@ from src.infrastructure.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# 服务所需的表（表名, 建表语句），按声明顺序创建
+_TABLES: List[Tuple[str, str]] = [
+    # 项目表
+    (
+        "project",
+        """
+        CREATE TABLE IF NOT EXISTS project (
+            id BIGINT PRIMARY KEY AUTO_INCREMENT,
+            name VARCHAR(128) NOT NULL UNIQUE COMMENT '项目名称',
+            description VARCHAR(400) COMMENT '项目描述',
+            creator_id CHAR(36) NOT NULL COMMENT '创建者用户ID(UUID)',
+            creator_name VARCHAR(128) NOT NULL COMMENT '创建者用户显示名',
+            created_at DATETIME NOT NULL COMMENT '创建时间',
+            editor_id CHAR(36) NOT NULL COMMENT '最近编辑者用户ID(UUID)',
+            editor_name VARCHAR(128) NOT NULL COMMENT '最近编辑者用户显示名',
+            edited_at DATETIME NOT NULL COMMENT '最近编辑时间',
+            INDEX idx_creator_id (creator_id),
+            INDEX idx_editor_id (editor_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目表'
+        """,
+    ),
+    # 项目节点表
+    (
+        "project_node",
+        """
+        CREATE TABLE IF NOT EXISTS project_node (
+            id CHAR(36) PRIMARY KEY COMMENT '节点 ID (UUID v4)',
+            project_id BIGINT NOT NULL COMMENT '所属项目 ID',
+            parent_id CHAR(36) DEFAULT NULL COMMENT '父节点 ID (UUID)',
+            node_type VARCHAR(32) NOT NULL COMMENT '节点类型：application/page/function',
+            name VARCHAR(255) NOT NULL COMMENT '节点名称',
+            description TEXT COMMENT '节点描述',
+            path VARCHAR(1024) NOT NULL COMMENT '节点路径，如 /node_<uuid>',
+            sort INT DEFAULT 0 COMMENT '同级排序',
+            status TINYINT DEFAULT 1 COMMENT '节点状态',
+            document_id BIGINT DEFAULT NULL COMMENT '功能节点关联的文档 ID',
+            creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
+            creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
+            created_at DATETIME COMMENT '创建时间',
+            editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
+            editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
+            edited_at DATETIME COMMENT '最近编辑时间',
+            INDEX idx_project(project_id),
+            INDEX idx_parent(parent_id),
+            INDEX idx_path(path(255)),
+            INDEX idx_document_id(document_id),
+            INDEX idx_creator_id (creator_id),
+            INDEX idx_editor_id (editor_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目节点表'
+        """,
+    ),
+    # 节点类型约束表
+    (
+        "node_type",
+        """
+        CREATE TABLE IF NOT EXISTS node_type (
+            code VARCHAR(32) PRIMARY KEY COMMENT '节点类型代码',
+            name VARCHAR(64) COMMENT '节点类型名称',
+            parent_allow VARCHAR(255) COMMENT '允许的父节点类型，逗号分隔'
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='节点类型约束表'
+        """,
+    ),
+    # 功能设计文档表
+    (
+        "function_document",
+        """
+        CREATE TABLE IF NOT EXISTS function_document (
+            id BIGINT PRIMARY KEY AUTO_INCREMENT,
+            function_node_id CHAR(36) UNIQUE NOT NULL COMMENT '关联的功能节点 ID (UUID)',
+            creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
+            creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
+            created_at DATETIME COMMENT '创建时间',
+            editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
+            editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
+            edited_at DATETIME COMMENT '最近编辑时间'
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='功能设计文档表'
+        """,
+    ),
+    # 项目词典表
+    (
+        "dictionary",
+        """
+        CREATE TABLE IF NOT EXISTS dictionary (
+            id BIGINT PRIMARY KEY AUTO_INCREMENT,
+            project_id BIGINT NOT NULL COMMENT '所属项目 ID',
+            term VARCHAR(255) NOT NULL COMMENT '术语名称',
+            definition TEXT NOT NULL COMMENT '术语定义',
+            creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
+            creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
+            created_at DATETIME COMMENT '创建时间',
+            editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
+            editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
+            edited_at DATETIME COMMENT '最近编辑时间',
+            UNIQUE KEY uk_project_term(project_id, term)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目词典表'
+        """,
+    ),
+    # 文档内容表
+    (
+        "document_content",
+        """
+        CREATE TABLE IF NOT EXISTS document_content (
+            document_id BIGINT PRIMARY KEY COMMENT '文档 ID，关联 function_document.id',
+            content JSON NOT NULL COMMENT '文档内容（单 JSON 对象）',
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                COMMENT '更新时间'
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='文档内容表'
+        """,
+    ),
+    # 文档块表
+    (
+        "document_block",
+        """
+        CREATE TABLE IF NOT EXISTS document_block (
+            id BIGINT PRIMARY KEY AUTO_INCREMENT COMMENT '块 ID',
+            document_id BIGINT NOT NULL COMMENT '文档 ID',
+            type VARCHAR(32) NOT NULL COMMENT '块类型：text/list/table/plugin',
+            content JSON COMMENT '块内容',
+            `order` INT NOT NULL DEFAULT 0 COMMENT '排序',
+            updated_at DATETIME COMMENT '更新时间',
+            INDEX idx_document_order (document_id, `order`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='文档块表'
+        """,
+    ),
+]
+
+# 迁移：为已存在的表补充新增列（表名, 列名, ALTER 语句）
+_COLUMNS: List[Tuple[str, str, str]] = [
+    # 为已存在的 project_node 表添加 document_id 列（若不存在）
+    (
+        "project_node",
+        "document_id",
+        "ALTER TABLE project_node ADD COLUMN document_id BIGINT DEFAULT NULL "
+        "COMMENT '功能节点关联的文档 ID' AFTER status",
+    ),
+]
+
 
 async def ensure_tables_exist(settings: Settings) -> None:
     """
@@ -41,147 +178,8 @@ async def ensure_tables_exist(settings: Settings) -> None:
             await cursor.execute(f"USE `{settings.db_name}`")
             logger.info(f"数据库 '{settings.db_name}' 已就绪")
 
-            # 项目表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "project",
-                """
-                CREATE TABLE IF NOT EXISTS project (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(128) NOT NULL UNIQUE COMMENT '项目名称',
-                    description VARCHAR(400) COMMENT '项目描述',
-                    creator_id CHAR(36) NOT NULL COMMENT '创建者用户ID(UUID)',
-                    creator_name VARCHAR(128) NOT NULL COMMENT '创建者用户显示名',
-                    created_at DATETIME NOT NULL COMMENT '创建时间',
-                    editor_id CHAR(36) NOT NULL COMMENT '最近编辑者用户ID(UUID)',
-                    editor_name VARCHAR(128) NOT NULL COMMENT '最近编辑者用户显示名',
-                    edited_at DATETIME NOT NULL COMMENT '最近编辑时间',
-                    INDEX idx_creator_id (creator_id),
-                    INDEX idx_editor_id (editor_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目表'
-                """,
-            )
-
-            # 项目节点表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "project_node",
-                """
-                CREATE TABLE IF NOT EXISTS project_node (
-                    id CHAR(36) PRIMARY KEY COMMENT '节点 ID (UUID v4)',
-                    project_id BIGINT NOT NULL COMMENT '所属项目 ID',
-                    parent_id CHAR(36) DEFAULT NULL COMMENT '父节点 ID (UUID)',
-                    node_type VARCHAR(32) NOT NULL COMMENT '节点类型：application/page/function',
-                    name VARCHAR(255) NOT NULL COMMENT '节点名称',
-                    description TEXT COMMENT '节点描述',
-                    path VARCHAR(1024) NOT NULL COMMENT '节点路径，如 /node_<uuid>',
-                    sort INT DEFAULT 0 COMMENT '同级排序',
-                    status TINYINT DEFAULT 1 COMMENT '节点状态',
-                    document_id BIGINT DEFAULT NULL COMMENT '功能节点关联的文档 ID',
-                    creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
-                    creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
-                    created_at DATETIME COMMENT '创建时间',
-                    editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
-                    editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
-                    edited_at DATETIME COMMENT '最近编辑时间',
-                    INDEX idx_project(project_id),
-                    INDEX idx_parent(parent_id),
-                    INDEX idx_path(path(255)),
-                    INDEX idx_document_id(document_id),
-                    INDEX idx_creator_id (creator_id),
-                    INDEX idx_editor_id (editor_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目节点表'
-                """,
-            )
-
-            # 节点类型约束表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "node_type",
-                """
-                CREATE TABLE IF NOT EXISTS node_type (
-                    code VARCHAR(32) PRIMARY KEY COMMENT '节点类型代码',
-                    name VARCHAR(64) COMMENT '节点类型名称',
-                    parent_allow VARCHAR(255) COMMENT '允许的父节点类型，逗号分隔'
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='节点类型约束表'
-                """,
-            )
-
-            # 功能设计文档表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "function_document",
-                """
-                CREATE TABLE IF NOT EXISTS function_document (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    function_node_id CHAR(36) UNIQUE NOT NULL COMMENT '关联的功能节点 ID (UUID)',
-                    creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
-                    creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
-                    created_at DATETIME COMMENT '创建时间',
-                    editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
-                    editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
-                    edited_at DATETIME COMMENT '最近编辑时间'
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='功能设计文档表'
-                """,
-            )
-
-            # 项目词典表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "dictionary",
-                """
-                CREATE TABLE IF NOT EXISTS dictionary (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    project_id BIGINT NOT NULL COMMENT '所属项目 ID',
-                    term VARCHAR(255) NOT NULL COMMENT '术语名称',
-                    definition TEXT NOT NULL COMMENT '术语定义',
-                    creator_id CHAR(36) DEFAULT NULL COMMENT '创建者用户ID(UUID)',
-                    creator_name VARCHAR(128) DEFAULT NULL COMMENT '创建者用户显示名',
-                    created_at DATETIME COMMENT '创建时间',
-                    editor_id CHAR(36) DEFAULT NULL COMMENT '最近编辑者用户ID(UUID)',
-                    editor_name VARCHAR(128) DEFAULT NULL COMMENT '最近编辑者用户显示名',
-                    edited_at DATETIME COMMENT '最近编辑时间',
-                    UNIQUE KEY uk_project_term(project_id, term)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='项目词典表'
-                """,
-            )
-
-            # 文档内容表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "document_content",
-                """
-                CREATE TABLE IF NOT EXISTS document_content (
-                    document_id BIGINT PRIMARY KEY COMMENT '文档 ID，关联 function_document.id',
-                    content JSON NOT NULL COMMENT '文档内容（单 JSON 对象）',
-                    updated_at DATETIME NOT NULL COMMENT '更新时间'
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='文档内容表'
-                """,
-            )
-
-            # 文档块表
-            await _ensure_table_exists(
-                cursor,
-                settings.db_name,
-                "document_block",
-                """
-                CREATE TABLE IF NOT EXISTS document_block (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT COMMENT '块 ID',
-                    document_id BIGINT NOT NULL COMMENT '文档 ID',
-                    type VARCHAR(32) NOT NULL COMMENT '块类型：text/list/table/plugin',
-                    content JSON COMMENT '块内容',
-                    `order` INT NOT NULL DEFAULT 0 COMMENT '排序',
-                    updated_at DATETIME COMMENT '更新时间',
-                    INDEX idx_document_order (document_id, `order`)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='文档块表'
-                """,
-            )
+            # 一次查询获取已存在的表，仅对缺失的表执行建表语句
+            await _ensure_tables_exist(cursor, settings.db_name, _TABLES)
 
             # 初始化节点类型数据
             await cursor.execute(
@@ -193,15 +191,8 @@ async def ensure_tables_exist(settings: Settings) -> None:
                 """
             )
 
-            # 迁移：为已存在的 project_node 表添加 document_id 列（若不存在）
-            await _ensure_column_exists(
-                cursor,
-                settings.db_name,
-                "project_node",
-                "document_id",
-                "ALTER TABLE project_node ADD COLUMN document_id BIGINT DEFAULT NULL "
-                "COMMENT '功能节点关联的文档 ID' AFTER status",
-            )
+            # 迁移：一次查询获取已存在的列，仅对缺失的列执行 ALTER
+            await _ensure_columns_exist(cursor, settings.db_name, _COLUMNS)
 
         await connection.commit()
         logger.info("数据库表检查完成")
@@ -216,78 +207,87 @@ async def ensure_tables_exist(settings: Settings) -> None:
             connection.close()
 
 
-async def _ensure_table_exists(
+async def _ensure_tables_exist(
     cursor: aiomysql.Cursor,
     db_name: str,
-    table_name: str,
-    create_sql: str,
+    tables: List[Tuple[str, str]],
 ) -> None:
     """
-    确保表存在，如果不存在则创建。
+    确保表存在，不存在的表按声明顺序创建。
+
+    通过一次 INFORMATION_SCHEMA.TABLES 查询获取全部已存在的表，
+    避免逐表探测带来的多次往返与扫描。
 
     参数:
         cursor: 数据库游标
         db_name: 数据库名称
-        table_name: 表名
-        create_sql: 创建表的 SQL 语句
+        tables: (表名, 建表 SQL) 列表
     """
-    try:
-        await cursor.execute(
-            """
-            SELECT COUNT(*) as cnt
-            FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-            """,
-            (db_name, table_name),
-        )
-        result = await cursor.fetchone()
-        count = result[0] if result else 0
+    table_names = [name for name, _ in tables]
+    placeholders = ", ".join(["%s"] * len(table_names))
+    await cursor.execute(
+        f"""
+        SELECT TABLE_NAME
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+        """,
+        (db_name, *table_names),
+    )
+    existing = {row[0] for row in await cursor.fetchall()}
 
-        if count == 0:
+    for table_name, create_sql in tables:
+        if table_name in existing:
+            logger.debug(f"○ 表 '{table_name}' 已存在")
+            continue
+        try:
             await cursor.execute(create_sql)
             logger.info(f"✓ 表 '{table_name}' 已创建")
-        else:
-            logger.debug(f"○ 表 '{table_name}' 已存在")
-    except Exception as e:
-        logger.error(f"检查/创建表 '{table_name}' 失败: {e}", exc_info=True)
-        raise
+        except Exception as e:
+            logger.error(f"检查/创建表 '{table_name}' 失败: {e}", exc_info=True)
+            raise
 
 
-async def _ensure_column_exists(
+async def _ensure_columns_exist(
     cursor: aiomysql.Cursor,
     db_name: str,
-    table_name: str,
-    column_name: str,
-    alter_sql: str,
+    columns: List[Tuple[str, str, str]],
 ) -> None:
     """
-    确保列存在，如果不存在则添加。
+    确保列存在，不存在的列通过 ALTER 语句添加。
+
+    通过一次 INFORMATION_SCHEMA.COLUMNS 查询获取相关表的全部目标列。
 
     参数:
         cursor: 数据库游标
         db_name: 数据库名称
-        table_name: 表名
-        column_name: 列名
-        alter_sql: 添加列的 SQL 语句
+        columns: (表名, 列名, 添加列的 SQL) 列表
     """
+    if not columns:
+        return
+    table_names = list(dict.fromkeys(table for table, _, _ in columns))
+    column_names = list(dict.fromkeys(column for _, column, _ in columns))
     try:
         await cursor.execute(
-            """
-            SELECT COUNT(*) as cnt
+            f"""
+            SELECT TABLE_NAME, COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
             WHERE TABLE_SCHEMA = %s
-            AND TABLE_NAME = %s
-            AND COLUMN_NAME = %s
+            AND TABLE_NAME IN ({", ".join(["%s"] * len(table_names))})
+            AND COLUMN_NAME IN ({", ".join(["%s"] * len(column_names))})
             """,
-            (db_name, table_name, column_name),
+            (db_name, *table_names, *column_names),
         )
-        result = await cursor.fetchone()
-        count = result[0] if result else 0
+        existing = {(row[0], row[1]) for row in await cursor.fetchall()}
+    except Exception as e:
+        logger.warning(f"检查列失败: {e}")
+        return
 
-        if count == 0:
+    for table_name, column_name, alter_sql in columns:
+        if (table_name, column_name) in existing:
+            logger.debug(f"○ 表 '{table_name}' 的列 '{column_name}' 已存在")
+            continue
+        try:
             await cursor.execute(alter_sql)
             logger.info(f"✓ 表 '{table_name}' 的列 '{column_name}' 已添加")
-        else:
-            logger.debug(f"○ 表 '{table_name}' 的列 '{column_name}' 已存在")
-    except Exception as e:
-        logger.warning(f"检查/添加列 '{table_name}.{column_name}' 失败: {e}")
+        except Exception as e:
+            logger.warning(f"检查/添加列 '{table_name}.{column_name}' 失败: {e}")
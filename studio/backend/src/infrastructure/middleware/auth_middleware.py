@@ -1,22 +1,24 @@
 """
 认证中间件
 
-统一从请求头提取认证token并存储到request.state和TokenContext中，供后续处理使用。
+统一从请求头提取认证token并存储到 ASGI scope 中，供后续处理使用。
+以纯 ASGI 中间件实现，直接读取 scope 中的路径与原始请求头。
 同时进行token内省并获取用户信息，存储到上下文中。
 与 hub 实现一致：通过 Hydra 内省获取用户 ID，再通过用户管理服务获取用户详情。
 对于需要认证的路径，如果没有token则拒绝访问。
 """
 import logging
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.infrastructure.context.token_context import TokenContext, UserContext
+from src.infrastructure.context.token_context import UserContext
 from src.infrastructure.container import get_container
 from src.infrastructure.exceptions import UnauthorizedError
-from src.ports.user_management_port import UserInfo
+from src.ports.hydra_port import HydraError, HydraPort
+from src.ports.user_management_port import UserInfo, UserManagementError, UserManagementPort
 
 logger = logging.getLogger(__name__)
 
@@ -29,24 +31,105 @@ PUBLIC_PATHS = [
     "/openapi.json",
 ]
 
-# 内部接口路径前缀（不需要认证）
+# 内部接口路径前缀（不需要认证，须位于路径开头）
 INTERNAL_PATHS = [
     "/internal/",
 ]
 
+# 公开路径精确匹配集合（最常见情形，一次哈希查找）
+_PUBLIC_EXACT = frozenset(PUBLIC_PATHS)
 
-class AuthMiddleware(BaseHTTPMiddleware):
+# 内部接口前缀元组（str.startswith 一次调用匹配全部前缀）
+_INTERNAL_PREFIXES = tuple(INTERNAL_PATHS)
+
+# 其余公开路径匹配规则预编译为单个正则（模块加载时构建一次）：
+# - 以公开路径结尾（可带末尾 "/"，兼容带前缀的路径，如 /api/dip-studio/v1/health）；
+# - 以公开路径开头并紧跟 "/" 或 "?"。
+_PUBLIC_ALTERNATION = "|".join(re.escape(p) for p in PUBLIC_PATHS)
+_PUBLIC_PATH_RE = re.compile(
+    rf"(?:{_PUBLIC_ALTERNATION})/?\Z"
+    + rf"|^(?:{_PUBLIC_ALTERNATION})[/?]"
+)
+
+
+def _unauthorized_body(description: str, solution: str = "请使用有效的token重新登录") -> bytes:
+    """预先序列化 401 响应体（与 UnauthorizedError.to_response() 的输出一致）。"""
+    return bytes(UnauthorizedError(
+        description=description,
+        solution=solution,
+    ).to_response().body)
+
+
+# 静态 401 响应体：模块加载时序列化一次，失败路径上不再构造异常与 JSON 编码
+_MISSING_TOKEN_BODY = _unauthorized_body(
+    "访问此资源需要认证", solution="请在请求头中提供有效的Authorization token"
+)
+_INVALID_TOKEN_BODY = _unauthorized_body("Token无效或已过期")
+_USER_LOOKUP_FAILED_BODY = _unauthorized_body("无法获取用户信息")
+_VERIFY_FAILED_BODY = _unauthorized_body("Token验证失败")
+
+
+async def _send_unauthorized(send: Send, body: bytes) -> None:
+    """直接发送 401 响应（预先序列化的 JSON 响应体）。"""
+    await send({
+        "type": "http.response.start",
+        "status": 401,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _get_authorization(scope: Scope) -> Optional[str]:
+    """从 ASGI scope 的原始请求头中查找 Authorization（ASGI 规定请求头名为小写字节串）。"""
+    headers: List[Tuple[bytes, bytes]] = scope["headers"]
+    for name, value in headers:
+        if name == b"authorization":
+            return value.decode("latin-1")
+    return None
+
+
+class AuthMiddleware:
     """
-    认证中间件。
+    认证中间件（纯 ASGI 实现）。
+
+    不继承 BaseHTTPMiddleware：后者会为每个请求额外创建任务与内存流来运行下游应用，
+    这里直接在当前任务中调用下游应用。
 
     从请求头中提取 Authorization token，进行内省验证，并存储到：
-    1. request.state.auth_token - 供路由层使用
-    2. TokenContext - 供适配器层统一获取
-    3. UserContext - 供应用层统一获取用户信息（由 Hydra 内省 + 用户管理服务获取）
+    1. scope["auth_token"] / scope["user_id"] / scope["user_info"]
+       - 供路由层通过 get_*_from_request 使用
+    2. UserContext - 供应用层统一获取用户信息（由 Hydra 内省 + 用户管理服务获取）
 
     对于需要认证的路径，如果没有 token 或 token 无效则拒绝访问。
     """
 
+    def __init__(
+        self,
+        app: ASGIApp,
+        hydra: Optional[HydraPort] = None,
+        user_management: Optional[UserManagementPort] = None,
+    ):
+        """
+        初始化中间件。
+
+        依赖在启动时解析一次，避免每个请求都访问容器；未显式传入时从全局容器获取。
+
+        参数:
+            app: 下游 ASGI 应用
+            hydra: Hydra 端口（token 内省）
+            user_management: 用户管理端口（获取用户信息）
+        """
+        self.app = app
+        if hydra is None or user_management is None:
+            container = get_container()
+            hydra = hydra or container.hydra_adapter
+            user_management = user_management or container.user_management_adapter
+        self._hydra = hydra
+        self._user_management = user_management
+
     def _is_public_path(self, path: str) -> bool:
         """
         判断路径是否为公开路径（不需要认证）。
@@ -57,104 +140,93 @@ class AuthMiddleware(BaseHTTPMiddleware):
         返回:
             bool: 如果是公开路径返回True，否则返回False
         """
-        # 检查是否为内部接口
-        for internal_path in INTERNAL_PATHS:
-            if internal_path in path:
-                return True
-
-        # 检查路径是否以公开路径前缀开头
-        for public_path in PUBLIC_PATHS:
-            if path == public_path:
-                return True
-            if path.endswith(public_path) or path.endswith(public_path + "/"):
-                return True
-            if path.startswith(public_path + "/") or path.startswith(public_path + "?"):
-                return True
-        return False
-
-    async def dispatch(self, request: Request, call_next) -> Response:
+        if path in _PUBLIC_EXACT:
+            return True
+        # 内部接口必须以前缀开头（子串匹配会把 /api/x/internal/... 误判为内部接口而跳过认证）
+        if path.startswith(_INTERNAL_PREFIXES):
+            return True
+        return _PUBLIC_PATH_RE.search(path) is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         处理请求，提取认证 token，进行内省并获取用户信息。
+
+        非 HTTP 请求（lifespan、websocket）直接交给下游应用。
         """
-        path = request.url.path
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
+        # 公开路径未设置任何上下文，无需清理
         if self._is_public_path(path):
-            try:
-                response = await call_next(request)
-                return response
-            finally:
-                TokenContext.clear_token()
-                UserContext.clear_user_info()
-
-        auth_header = request.headers.get("Authorization")
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = _get_authorization(scope)
         if not auth_header:
-            logger.warning(f"请求路径 {path} 需要认证，但未提供token")
-            error = UnauthorizedError(
-                description="访问此资源需要认证",
-                solution="请在请求头中提供有效的Authorization token",
-            )
-            return error.to_response()
-
-        if auth_header.startswith("Bearer "):
-            auth_token = auth_header[7:]
-        else:
-            auth_token = auth_header
+            logger.warning("请求路径 %s 需要认证，但未提供token", path)
+            await _send_unauthorized(send, _MISSING_TOKEN_BODY)
+            return
+
+        # 绝大多数为 Bearer token；固定前缀比较用切片
+        auth_token = auth_header[7:] if auth_header[:7] == "Bearer " else auth_header
 
         if not auth_token:
-            logger.warning(f"请求路径 {path} 需要认证，但token为空")
-            error = UnauthorizedError(
-                description="访问此资源需要认证",
-                solution="请在请求头中提供有效的Authorization token",
-            )
-            return error.to_response()
-
-        request.state.auth_token = auth_header
-        TokenContext.set_token(auth_token)
-
-        # 与 hub 一致：内省 token 获取用户 ID，再通过用户管理服务获取用户信息
-        user_info = None
+            logger.warning("请求路径 %s 需要认证，但token为空", path)
+            await _send_unauthorized(send, _MISSING_TOKEN_BODY)
+            return
+
+        # 直接存入 scope（不经 request.state），通过 get_*_from_request 读取
+        scope["auth_token"] = auth_header
+
+        # 与 hub 一致：内省 token 获取用户 ID，再通过用户管理服务获取用户信息。
+        # 上游服务失败属于预期内的认证失败，仅记录 warning；其他异常才记录完整堆栈
         try:
-            container = get_container()
-            introspect = await container.hydra_adapter.introspect(auth_token)
-            if introspect.active and introspect.visitor_id:
-                user_infos = await container.user_management_adapter.batch_get_user_info_by_id(
-                    [introspect.visitor_id]
-                )
-                if introspect.visitor_id in user_infos:
-                    user_info = user_infos[introspect.visitor_id]
-                    logger.debug(f"用户信息已获取: {user_info.id} ({user_info.vision_name})")
-                else:
-                    logger.warning(f"无法获取用户信息: {introspect.visitor_id}")
-                    error = UnauthorizedError(
-                        description="无法获取用户信息",
-                        solution="请使用有效的token重新登录",
-                    )
-                    return error.to_response()
-            else:
-                logger.warning("Token 内省结果：token 无效或无法获取用户ID")
-                error = UnauthorizedError(
-                    description="Token无效或已过期",
-                    solution="请使用有效的token重新登录",
-                )
-                return error.to_response()
-        except Exception as e:
-            logger.error(f"Token 内省或获取用户信息失败: {e}", exc_info=True)
-            error = UnauthorizedError(
-                description="Token验证失败",
-                solution="请使用有效的token重新登录",
-            )
-            return error.to_response()
-
-        UserContext.set_user_info(user_info)
-        request.state.user_id = user_info.id
-        request.state.user_info = user_info
+            # 优先离线验证 JWT；不透明 token 或无法离线判定时回退到 Hydra 在线内省
+            introspect = await self._hydra.introspect_offline(auth_token)
+            if introspect is None:
+                introspect = await self._hydra.introspect(auth_token)
+        except HydraError as e:
+            logger.warning("Token 内省失败: %s", e)
+            await _send_unauthorized(send, _VERIFY_FAILED_BODY)
+            return
+        except Exception:
+            logger.error("Token 内省出现未预期的异常", exc_info=True)
+            await _send_unauthorized(send, _VERIFY_FAILED_BODY)
+            return
+
+        if not (introspect.active and introspect.visitor_id):
+            logger.warning("Token 内省结果：token 无效或无法获取用户ID")
+            await _send_unauthorized(send, _INVALID_TOKEN_BODY)
+            return
+
+        try:
+            user_info = await self._user_management.get_user_info_by_id(introspect.visitor_id)
+        except UserManagementError as e:
+            logger.warning("获取用户信息失败: %s, %s", introspect.visitor_id, e)
+            await _send_unauthorized(send, _VERIFY_FAILED_BODY)
+            return
+        except Exception:
+            logger.error("获取用户信息出现未预期的异常: %s", introspect.visitor_id, exc_info=True)
+            await _send_unauthorized(send, _VERIFY_FAILED_BODY)
+            return
+
+        if user_info is None:
+            logger.warning("无法获取用户信息: %s", introspect.visitor_id)
+            await _send_unauthorized(send, _USER_LOOKUP_FAILED_BODY)
+            return
+        logger.debug("用户信息已获取: %s (%s)", user_info.id, user_info.vision_name)
+
+        user_context_token = UserContext.set_user_info(user_info)
+        scope["user_id"] = user_info.id
+        scope["user_info"] = user_info
 
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         finally:
-            TokenContext.clear_token()
-            UserContext.clear_user_info()
+            UserContext.reset_user_info(user_context_token)
 
 
 def get_auth_token_from_request(request: Request) -> Optional[str]:
@@ -167,7 +239,8 @@ def get_auth_token_from_request(request: Request) -> Optional[str]:
     返回:
         Optional[str]: 认证Token，不存在时返回None
     """
-    return getattr(request.state, "auth_token", None)
+    auth_token: Optional[str] = request.scope.get("auth_token")
+    return auth_token
 
 
 def get_user_id_from_request(request: Request) -> str:
@@ -180,7 +253,8 @@ def get_user_id_from_request(request: Request) -> str:
     返回:
         str: 用户ID，不存在时返回空字符串
     """
-    return getattr(request.state, "user_id", "")
+    user_id: str = request.scope.get("user_id", "")
+    return user_id
 
 
 def get_user_info_from_request(request: Request) -> Optional[UserInfo]:
@@ -193,4 +267,5 @@ def get_user_info_from_request(request: Request) -> Optional[UserInfo]:
     返回:
         Optional[UserInfo]: 用户信息，不存在时返回None
     """
-    return getattr(request.state, "user_info", None)
+    user_info: Optional[UserInfo] = request.scope.get("user_info")
+    return user_info
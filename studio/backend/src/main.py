@@ -77,7 +77,7 @@ def create_app(settings: Settings = None) -> FastAPI:
         logger.info("正在关闭服务")
         container.set_ready(False)
 
-        # 关闭数据库连接池
+        # 关闭数据库连接池与外部服务 HTTP 客户端
         await container.close()
         logger.info("资源已释放")
     
@@ -92,8 +92,12 @@ def create_app(settings: Settings = None) -> FastAPI:
         openapi_url=f"{settings.api_prefix}/openapi.json",
     )
     
-    # 添加认证中间件
-    app.add_middleware(AuthMiddleware)
+    # 添加认证中间件（依赖在此注入，请求路径上不再访问容器）
+    app.add_middleware(
+        AuthMiddleware,
+        hydra=container.hydra_adapter,
+        user_management=container.user_management_adapter,
+    )
     
     # 添加 CORS 中间件
     app.add_middleware(
@@ -22,11 +22,13 @@ class DocumentContentPort(ABC):
         """
         获取文档内容（单 JSON 对象）。
 
+        实现可合并同一文档的并发读取，返回的对象可能与其他调用方共享，调用方应视为只读。
+
         参数:
             document_id: 文档 ID
 
         返回:
-            dict: 文档内容，未初始化时返回 {}
+            dict: 文档内容（只读），未初始化时返回 {}
         """
         pass
 
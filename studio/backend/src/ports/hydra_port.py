@@ -9,12 +9,17 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IntrospectResponse:
-    """Token 内省响应"""
+    """Token 内省响应；不可变，缓存的同一实例会在多个请求间共享"""
     active: bool
     visitor_id: Optional[str] = None
     visitor_typ: Optional[str] = None
+    exp: Optional[int] = None  # token 过期时间（Unix 时间戳，秒）
+
+
+class HydraError(Exception):
+    """Hydra 服务调用失败（网络错误、非 2xx 响应或响应无法解析）。"""
 
 
 class HydraPort(ABC):
@@ -22,6 +27,9 @@ class HydraPort(ABC):
     Hydra 端口接口。
 
     这是一个输出端口（被驱动端口），定义了应用程序与 Hydra OAuth2/OIDC 服务的交互方式。
+
+    该端口在每个需认证的请求上都会被调用：HTTP 实现应在适配器生命周期内复用同一个
+    带连接池与 keep-alive 的客户端（如 httpx.AsyncClient），不要每次调用新建客户端或连接。
     """
 
     @abstractmethod
@@ -36,6 +44,22 @@ class HydraPort(ABC):
             IntrospectResponse: 内省响应
 
         异常:
-            Exception: 当内省失败时抛出
+            HydraError: 当内省请求失败时抛出
         """
         pass
+
+    async def introspect_offline(self, token: str) -> Optional[IntrospectResponse]:
+        """
+        离线验证 Token（本地校验 JWT 签名与有效期，不访问 Hydra）。
+
+        默认不支持离线验证，返回 None；调用方应回退到 introspect()。
+
+        参数:
+            token: 访问令牌
+
+        返回:
+            Optional[IntrospectResponse]: 可离线判定时返回内省响应
+            （签名无效或已过期时 active=False）；
+            无法离线判定（如非 JWT 的不透明 token、未启用或密钥不可用）时返回 None
+        """
+        return None
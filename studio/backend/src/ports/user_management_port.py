@@ -9,9 +9,9 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserInfo:
-    """用户信息（与 hub 一致）"""
+    """用户信息（与 hub 一致）；不可变，同一实例可能在多个请求间共享"""
     id: str
     account: str
     vision_name: str
@@ -27,11 +27,21 @@ class UserInfo:
     parent_deps: Optional[list] = None  # 组织结构
 
 
+class UserManagementError(Exception):
+    """用户管理服务调用失败（网络错误、非 2xx 响应或响应无法解析）。"""
+
+
 class UserManagementPort(ABC):
     """
     User Management 端口接口。
 
     这是一个输出端口（被驱动端口），定义了应用程序与用户管理服务的交互方式。
+
+    认证中间件在缓存未命中时会按请求查询当前用户，HTTP 实现应持有一个长期存活的
+    连接池客户端（keep-alive 复用连接），并在关闭时释放。
+
+    返回的 UserInfo 可以是缓存的共享实例（用户信息未变化时复用同一对象），
+    调用方不得修改其字段或其中的 roles / groups / parent_deps 容器。
     """
 
     @abstractmethod
@@ -46,6 +56,22 @@ class UserManagementPort(ABC):
             Dict[str, UserInfo]: 用户信息字典，key 为用户 ID
 
         异常:
-            Exception: 当获取失败时抛出
+            UserManagementError: 当获取失败时抛出
+        """
+        pass
+
+    @abstractmethod
+    async def get_user_info_by_id(self, user_id: str) -> Optional[UserInfo]:
+        """
+        获取单个用户信息（如认证中间件按当前用户 ID 查询）。
+
+        参数:
+            user_id: 用户 ID
+
+        返回:
+            Optional[UserInfo]: 用户信息，用户不存在时返回 None
+
+        异常:
+            UserManagementError: 当获取失败时抛出
         """
         pass
@@ -4,8 +4,9 @@
 项目词典管理端点的 FastAPI 路由。
 """
 import logging
-from typing import List
+from typing import Any, List
 
+import orjson
 from fastapi import APIRouter, Path, Query, status
 from fastapi.responses import Response
 
@@ -34,19 +35,17 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
     """
     router = APIRouter(prefix="/dictionary", tags=["Dictionary"])
 
-    def _entry_to_response(entry) -> DictionaryEntryResponse:
-        """将词典条目领域模型转换为响应模型。"""
-        return DictionaryEntryResponse(
-            id=entry.id,
-            project_id=entry.project_id,
-            term=entry.term,
-            definition=entry.definition,
-            creator_id=entry.creator_id,
-            creator_name=entry.creator_name,
-            created_at=entry.created_at,
-            editor_id=entry.editor_id,
-            editor_name=entry.editor_name,
-            edited_at=entry.edited_at,
+    def _json_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+        """
+        直接用 orjson 序列化领域模型（dataclass）并返回 JSON 响应。
+
+        绕过响应模型的逐行构造与校验；datetime 由 orjson 原生输出为 ISO 8601，
+        与响应模型的序列化结果一致。response_model 仍保留用于 OpenAPI 文档。
+        """
+        return Response(
+            content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_DATACLASS),
+            status_code=status_code,
+            media_type="application/json",
         )
 
     @router.post(
@@ -61,7 +60,7 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
             409: {"description": "术语已存在", "model": ErrorResponse},
         }
     )
-    async def create_entry(request: CreateDictionaryEntryRequest) -> DictionaryEntryResponse:
+    async def create_entry(request: CreateDictionaryEntryRequest) -> Response:
         """新增术语。"""
         try:
             entry = await dictionary_service.create_entry(
@@ -71,7 +70,7 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
                 creator_id=get_user_id(),
                 creator_name=get_user_name(),
             )
-            return _entry_to_response(entry)
+            return _json_response(entry, status.HTTP_201_CREATED)
         except ValueError as e:
             error_msg = str(e)
             if "已存在" in error_msg:
@@ -97,11 +96,11 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
     )
     async def get_entries(
         project_id: int = Query(..., description="项目 ID", ge=1),
-    ) -> List[DictionaryEntryResponse]:
+    ) -> Response:
         """查询词典。"""
         try:
             entries = await dictionary_service.get_entries_by_project_id(project_id)
-            return [_entry_to_response(e) for e in entries]
+            return _json_response(entries)
         except Exception as e:
             logger.exception(f"查询词典失败: {e}")
             raise InternalError(description=f"查询词典失败: {str(e)}")
@@ -121,7 +120,7 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
     async def update_entry(
         request: UpdateDictionaryEntryRequest,
         entry_id: int = Path(..., description="条目 ID", ge=1),
-    ) -> DictionaryEntryResponse:
+    ) -> Response:
         """更新术语。"""
         try:
             entry = await dictionary_service.update_entry(
@@ -131,7 +130,7 @@ def create_dictionary_router(dictionary_service: DictionaryService) -> APIRouter
                 editor_id=get_user_id(),
                 editor_name=get_user_name(),
             )
-            return _entry_to_response(entry)
+            return _json_response(entry)
         except ValueError as e:
             error_msg = str(e)
             if "不存在" in error_msg:
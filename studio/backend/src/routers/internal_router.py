@@ -1,7 +1,7 @@
 """
 内部接口路由（无认证，供 MCP Server 等调用）
 
-路径包含 /internal/ 时认证中间件会放行。
+路径以 /internal/ 开头时认证中间件会放行。
 """
 import logging
 
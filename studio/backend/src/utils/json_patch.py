@@ -0,0 +1,233 @@
+"""
+JSON Patch（RFC 6902）应用
+
+替代纯 Python 的 jsonpatch/jsonpointer 库：每个操作的 path/from 预先一次性解析为
+token 元组，应用时用普通循环逐级定位，并按 op 通过分发表调用对应处理函数。
+仅面向 JSON 数据（dict/list/str/数字/bool/None），文档会被原地修改。
+"""
+import copy
+from typing import Any, Callable, Dict, List, Tuple
+
+import orjson
+
+Tokens = Tuple[str, ...]
+
+
+class JsonPatchError(ValueError):
+    """JSON Patch 格式错误或应用失败。"""
+
+
+def parse_pointer(pointer: Any) -> Tokens:
+    """
+    将 JSON Pointer（RFC 6901）解析为 token 元组。
+
+    参数:
+        pointer: JSON Pointer 字符串，如 "/content/0/text"；"" 表示整个文档
+
+    返回:
+        Tokens: 解析后的 token 元组（已处理 ~1 / ~0 转义）
+
+    异常:
+        JsonPatchError: 指针格式无效时抛出
+    """
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"无效的 JSON Pointer: {pointer!r}")
+    if pointer == "":
+        return ()
+    if pointer[0] != "/":
+        raise JsonPatchError(f"JSON Pointer 必须以 '/' 开头: {pointer!r}")
+    tokens = pointer[1:].split("/")
+    if "~" in pointer:
+        unescaped = []
+        for token in tokens:
+            if token.replace("~0", "").replace("~1", "").count("~"):
+                raise JsonPatchError(f"JSON Pointer 转义无效: {pointer!r}")
+            unescaped.append(token.replace("~1", "/").replace("~0", "~"))
+        tokens = unescaped
+    return tuple(tokens)
+
+
+def _index(array: list, token: str, pointer: str, allow_end: bool = False) -> int:
+    """将 token 解析为数组下标；allow_end 时允许 "-" 或 len(array)（用于 add 插入末尾）。"""
+    size = len(array)
+    if token == "-" and allow_end:
+        return size
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"无效的数组下标 '{token}': {pointer}")
+    index = int(token)
+    if index > size or (index == size and not allow_end):
+        raise JsonPatchError(f"数组下标越界 '{token}': {pointer}")
+    return index
+
+
+def _resolve(doc: Any, tokens: Tokens, pointer: str) -> Any:
+    """按 token 逐级定位并返回目标值。"""
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"路径不存在: {pointer}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, pointer)]
+        else:
+            raise JsonPatchError(f"路径不存在: {pointer}")
+    return node
+
+
+def _clone(value: Any) -> Any:
+    """深拷贝 JSON 值（经 orjson 往返，比 copy.deepcopy 快得多；orjson 无法序列化时回退）。"""
+    if isinstance(value, (dict, list)):
+        try:
+            return orjson.loads(orjson.dumps(value))
+        except orjson.JSONEncodeError:
+            # 如超出 64 位的整数
+            return copy.deepcopy(value)
+    return value
+
+
+def _add(doc: Any, tokens: Tokens, pointer: str, value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1], pointer)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, key, pointer, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"目标父节点不是对象或数组: {pointer}")
+    return doc
+
+
+def _remove(doc: Any, tokens: Tokens, pointer: str) -> Any:
+    if not tokens:
+        raise JsonPatchError("不能删除整个文档")
+    parent = _resolve(doc, tokens[:-1], pointer)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"路径不存在: {pointer}")
+        del parent[key]
+    elif isinstance(parent, list):
+        del parent[_index(parent, key, pointer)]
+    else:
+        raise JsonPatchError(f"路径不存在: {pointer}")
+    return doc
+
+
+def _replace(doc: Any, tokens: Tokens, pointer: str, value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1], pointer)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"路径不存在: {pointer}")
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent[_index(parent, key, pointer)] = value
+    else:
+        raise JsonPatchError(f"路径不存在: {pointer}")
+    return doc
+
+
+def _op_add(doc: Any, operation: "_Operation") -> Any:
+    return _add(doc, operation.tokens, operation.path, operation.value)
+
+
+def _op_remove(doc: Any, operation: "_Operation") -> Any:
+    return _remove(doc, operation.tokens, operation.path)
+
+
+def _op_replace(doc: Any, operation: "_Operation") -> Any:
+    return _replace(doc, operation.tokens, operation.path, operation.value)
+
+
+def _op_move(doc: Any, operation: "_Operation") -> Any:
+    from_tokens = operation.from_tokens
+    if from_tokens == operation.tokens:
+        _resolve(doc, from_tokens, operation.from_path)
+        return doc
+    if operation.tokens[:len(from_tokens)] == from_tokens:
+        raise JsonPatchError(f"不能将节点移动到其子路径: {operation.from_path} -> {operation.path}")
+    value = _resolve(doc, from_tokens, operation.from_path)
+    doc = _remove(doc, from_tokens, operation.from_path)
+    return _add(doc, operation.tokens, operation.path, value)
+
+
+def _op_copy(doc: Any, operation: "_Operation") -> Any:
+    value = _resolve(doc, operation.from_tokens, operation.from_path)
+    return _add(doc, operation.tokens, operation.path, _clone(value))
+
+
+def _op_test(doc: Any, operation: "_Operation") -> Any:
+    if _resolve(doc, operation.tokens, operation.path) != operation.value:
+        raise JsonPatchError(f"test 操作未通过: {operation.path}")
+    return doc
+
+
+# op -> (处理函数, 是否需要 value, 是否需要 from)
+_HANDLERS: Dict[str, Tuple[Callable[[Any, "_Operation"], Any], bool, bool]] = {
+    "add": (_op_add, True, False),
+    "remove": (_op_remove, False, False),
+    "replace": (_op_replace, True, False),
+    "move": (_op_move, False, True),
+    "copy": (_op_copy, False, True),
+    "test": (_op_test, True, False),
+}
+
+
+class _Operation:
+    """预解析后的单个 Patch 操作。"""
+
+    __slots__ = ("handler", "path", "tokens", "value", "from_path", "from_tokens")
+
+    def __init__(self, operation: Any):
+        if not isinstance(operation, dict):
+            raise JsonPatchError(f"Patch 操作必须为对象: {operation!r}")
+        op = operation.get("op")
+        spec = _HANDLERS.get(op) if isinstance(op, str) else None
+        if spec is None:
+            raise JsonPatchError(f"不支持的操作: {op!r}")
+        self.handler, needs_value, needs_from = spec
+        if "path" not in operation:
+            raise JsonPatchError(f"{op} 操作缺少 path")
+        self.path = operation["path"]
+        self.tokens = parse_pointer(self.path)
+        if needs_value and "value" not in operation:
+            raise JsonPatchError(f"{op} 操作缺少 value")
+        self.value = operation.get("value")
+        if needs_from:
+            if "from" not in operation:
+                raise JsonPatchError(f"{op} 操作缺少 from")
+            self.from_path = operation["from"]
+            self.from_tokens = parse_pointer(self.from_path)
+        else:
+            self.from_path = None
+            self.from_tokens = ()
+
+
+def apply_patch(doc: Any, patch: List[dict]) -> Any:
+    """
+    对文档原地应用 JSON Patch（RFC 6902）。
+
+    所有操作先整体预解析（格式错误时不会修改文档），再依次应用。
+    应用中途失败时文档可能已被部分修改，调用方应传入可丢弃的副本。
+
+    参数:
+        doc: 目标文档（会被原地修改）
+        patch: Patch 操作数组
+
+    返回:
+        Any: 应用后的文档（根路径被 add/replace 时为新值，否则即 doc 本身）
+
+    异常:
+        JsonPatchError: Patch 格式无效或应用失败时抛出
+    """
+    if not isinstance(patch, list):
+        raise JsonPatchError("Patch 必须为操作数组")
+    operations = [_Operation(operation) for operation in patch]
+    for operation in operations:
+        doc = operation.handler(doc, operation)
+    return doc
@@ -0,0 +1,56 @@
+"""
+并发请求合并（single-flight）
+
+同一 key 的并发异步调用只执行一次，其余调用方等待并共享同一结果（或异常）。
+调用结束后即移除该 key，不做缓存；结果对象在调用方之间共享，应视为只读。
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """按 key 合并进行中的异步调用。"""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """
+        执行 fn(*args)；若同一 key 已有进行中的调用，则等待并复用其结果。
+
+        单个调用方被取消不会取消共享的调用（asyncio.shield），其余调用方仍可拿到结果。
+
+        参数:
+            key: 合并键
+            fn: 异步函数
+            *args: 传给 fn 的参数
+
+        返回:
+            T: fn 的返回值（并发调用方之间共享）
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._discard(key, done))
+        return await asyncio.shield(future)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        丢弃 key 对应的进行中调用，之后的调用将重新执行（如写入后使旧读取失效）。
+
+        已在等待的调用方仍会拿到原调用的结果。
+
+        参数:
+            key: 合并键
+        """
+        self._inflight.pop(key, None)
+
+    def _discard(self, key: Hashable, future: asyncio.Future) -> None:
+        """调用完成后移除 key（仅当仍是同一调用时），并标记异常已读取，避免无人等待时告警。"""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
@@ -4,8 +4,9 @@
 提供测试所需的 fixtures 和配置。
 """
 import asyncio
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Callable, Generator, List
 
+import httpx
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
@@ -51,3 +52,27 @@ async def client(app) -> AsyncGenerator[AsyncClient, None]:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
+
+
+@pytest_asyncio.fixture
+async def mock_upstream() -> AsyncGenerator[Callable, None]:
+    """
+    构建以 httpx.MockTransport 响应的 HTTP 适配器。
+
+    返回工厂 build(adapter_cls, settings, handler, requests)：handler 生成上游响应，
+    适配器发出的每个请求都会追加到 requests；测试结束时关闭所有构建的适配器。
+    """
+    adapters = []
+
+    def build(adapter_cls, settings: Settings, handler: Callable, requests: List[httpx.Request]):
+        def record(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return handler(request)
+
+        adapter = adapter_cls(settings, transport=httpx.MockTransport(record))
+        adapters.append(adapter)
+        return adapter
+
+    yield build
+    for adapter in adapters:
+        await adapter.aclose()
@@ -0,0 +1,164 @@
+"""
+认证中间件单元测试
+"""
+from typing import Optional
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.infrastructure.context import get_user_id
+from src.infrastructure.middleware.auth_middleware import (
+    AuthMiddleware,
+    get_auth_token_from_request,
+    get_user_id_from_request,
+)
+from src.ports.hydra_port import HydraError, HydraPort, IntrospectResponse
+from src.ports.user_management_port import UserInfo, UserManagementPort
+
+
+class FakeHydra(HydraPort):
+    """仅接受 token "good" 的 Hydra 端口；token "down" 模拟 Hydra 不可用。"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def introspect(self, token: str) -> IntrospectResponse:
+        self.calls += 1
+        if token == "down":
+            raise HydraError("connection refused")
+        if token == "good":
+            return IntrospectResponse(active=True, visitor_id="user-1")
+        return IntrospectResponse(active=False)
+
+
+class FakeUserManagement(UserManagementPort):
+    """仅包含用户 user-1 的用户管理端口。"""
+
+    async def batch_get_user_info_by_id(self, user_ids):
+        return {}
+
+    async def get_user_info_by_id(self, user_id: str) -> Optional[UserInfo]:
+        if user_id != "user-1":
+            return None
+        return UserInfo(
+            id=user_id, account="u1", vision_name="User 1", csf_level=0,
+            frozen=False, roles=None, email=None, telephone=None,
+            third_attr=None, third_id=None, user_type=1, groups=None, parent_deps=None,
+        )
+
+
+class TestIsPublicPath:
+    """公开路径判断测试。"""
+
+    @pytest.fixture
+    def middleware(self):
+        return AuthMiddleware(app=None, hydra=object(), user_management=object())
+
+    @pytest.mark.parametrize("path", [
+        "/health",
+        "/health/",
+        "/ready",
+        "/docs",
+        "/docs/oauth2-redirect",
+        "/openapi.json",
+        "/api/dip-studio/v1/health",
+        "/internal/api/dip-studio/v1/nodes",
+    ])
+    def test_public(self, middleware, path):
+        """测试公开路径与内部接口无需认证。"""
+        assert middleware._is_public_path(path)
+
+    @pytest.mark.parametrize("path", [
+        "/",
+        "/api/dip-studio/v1/projects",
+        "/healthz",
+        "/api/dip-studio/v1/health/detail",
+        "/api/dip-studio/v1/internal",
+        "/api/dip-studio/v1/internal/nodes",
+    ])
+    def test_protected(self, middleware, path):
+        """测试业务路径需要认证。"""
+        assert not middleware._is_public_path(path)
+
+
+class TestAuthFlow:
+    """认证流程测试。"""
+
+    @pytest.fixture
+    def hydra(self):
+        return FakeHydra()
+
+    @pytest.fixture
+    def client(self, hydra):
+        async def whoami(request):
+            return JSONResponse({
+                "user_id": get_user_id(),
+                "request_user_id": get_user_id_from_request(request),
+                "auth_token": get_auth_token_from_request(request),
+            })
+
+        app = Starlette(routes=[Route("/whoami", whoami), Route("/health", whoami)])
+        app.add_middleware(AuthMiddleware, hydra=hydra, user_management=FakeUserManagement())
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, client):
+        """测试有效 token 通过认证，并可在请求上下文中获取用户。"""
+        response = await client.get("/whoami", headers={"Authorization": "Bearer good"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "user_id": "user-1",
+            "request_user_id": "user-1",
+            "auth_token": "Bearer good",
+        }
+
+    @pytest.mark.asyncio
+    async def test_missing_or_invalid_token(self, client):
+        """测试缺少 token 或 token 无效时返回 401。"""
+        missing = await client.get("/whoami")
+        invalid = await client.get("/whoami", headers={"Authorization": "Bearer bad"})
+
+        assert missing.status_code == 401
+        assert missing.json()["description"] == "访问此资源需要认证"
+        assert invalid.status_code == 401
+        assert invalid.json() == {
+            "code": "UNAUTHORIZED",
+            "description": "Token无效或已过期",
+            "solution": "请使用有效的token重新登录",
+        }
+
+    @pytest.mark.asyncio
+    async def test_upstream_failure(self, client, caplog):
+        """测试 Hydra 调用失败时返回 401，且只记录 warning 而不输出堆栈。"""
+        response = await client.get("/whoami", headers={"Authorization": "Bearer down"})
+
+        assert response.status_code == 401
+        assert response.json()["description"] == "Token验证失败"
+        assert caplog.records and all(record.exc_info is None for record in caplog.records)
+
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passthrough(self, hydra):
+        """测试非 HTTP 请求（如 lifespan）直接交给下游应用，不做认证。"""
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(scope["type"])
+
+        middleware = AuthMiddleware(app=app, hydra=hydra, user_management=FakeUserManagement())
+        await middleware({"type": "lifespan"}, None, None)
+
+        assert seen == ["lifespan"]
+        assert hydra.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_public_path(self, client, hydra):
+        """测试公开路径无需 token 且不触发内省。"""
+        response = await client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"user_id": "", "request_user_id": "", "auth_token": None}
+        assert hydra.calls == 0
@@ -0,0 +1,272 @@
+"""
+文档内容适配器单元测试
+"""
+from contextlib import asynccontextmanager
+
+import orjson
+import pytest
+
+from src.adapters.document_content_adapter import (
+    DocumentContentAdapter,
+    _build_server_side_patch,
+    _ensure_tiptap_content,
+    _loads,
+)
+
+
+class TestEnsureTiptapContent:
+    """TipTap 文档规范化测试。"""
+
+    def test_fill_missing_content(self):
+        """测试为缺少 content 的节点补全默认值。"""
+        doc = {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph"},
+                {"type": "heading", "attrs": {"level": 2}},
+                {"type": "bulletList"},
+                {"type": "image", "attrs": {"src": "a.png"}},
+            ],
+        }
+
+        result = _ensure_tiptap_content(doc)
+
+        assert result is doc
+        assert doc["content"][0]["content"] == [{"type": "text", "text": ""}]
+        assert doc["content"][1]["content"] == [{"type": "text", "text": ""}]
+        assert doc["content"][2]["content"] == []
+        assert "content" not in doc["content"][3]
+
+    def test_nested_nodes(self):
+        """测试深层嵌套节点同样被补全，且默认内联节点互不共享。"""
+        doc = {
+            "type": "doc",
+            "content": [
+                {"type": "bulletList", "content": [
+                    {"type": "listItem", "content": [{"type": "paragraph"}]},
+                    {"type": "listItem", "content": [{"type": "paragraph"}]},
+                ]},
+            ],
+        }
+
+        _ensure_tiptap_content(doc)
+
+        items = doc["content"][0]["content"]
+        first = items[0]["content"][0]["content"]
+        second = items[1]["content"][0]["content"]
+        assert first == [{"type": "text", "text": ""}]
+        assert first is not second
+
+    def test_keep_existing_content(self):
+        """测试已有 content 的节点保持不变。"""
+        doc = {"type": "paragraph", "content": [{"type": "text", "text": "hi"}]}
+
+        _ensure_tiptap_content(doc)
+
+        assert doc == {"type": "paragraph", "content": [{"type": "text", "text": "hi"}]}
+
+    def test_non_dict_input(self):
+        """测试非对象输入原样返回。"""
+        assert _ensure_tiptap_content(None) is None
+        assert _ensure_tiptap_content([1, 2]) == [1, 2]
+
+
+class TestBuildServerSidePatch:
+    """服务端 JSON Patch 翻译测试。"""
+
+    def test_replace_leaf(self):
+        """测试 replace 翻译为 JSON_REPLACE，并校验路径存在与下标容器为数组。"""
+        sql, params = _build_server_side_patch(
+            [{"op": "replace", "path": "/content/0/text", "value": "hi"}]
+        )
+
+        assert sql.startswith("content = JSON_REPLACE(content, %s, JSON_EXTRACT(%s, '$'))")
+        assert "JSON_CONTAINS_PATH(content, 'all', %s)" in sql
+        assert params == [
+            '$."content"[0]."text"', '"hi"',
+            '$."content"[0]."text"',
+            '$."content"',
+        ]
+
+    def test_single_remove(self):
+        """测试单个 remove 翻译为 JSON_REMOVE。"""
+        sql, params = _build_server_side_patch([{"op": "remove", "path": "/title"}])
+
+        assert sql.startswith("content = JSON_REMOVE(content, %s)")
+        assert params == ['$."title"', '$."title"']
+
+    def test_fallback_cases(self):
+        """测试服务端无法等价表达的 Patch 返回 None。"""
+        cases = [
+            [{"op": "add", "path": "/a", "value": 1}],
+            [{"op": "replace", "path": "", "value": {}}],
+            [{"op": "replace", "path": "/a", "value": None}],
+            [{"op": "replace", "path": '/a"b', "value": 1}],
+            [
+                {"op": "replace", "path": "/a", "value": 1},
+                {"op": "replace", "path": "/a/b", "value": 2},
+            ],
+            [{"op": "remove", "path": "/a"}, {"op": "remove", "path": "/b"}],
+        ]
+        for patch in cases:
+            assert _build_server_side_patch(patch) is None
+
+
+class TestLoads:
+    """数据库 JSON 内容解析测试。"""
+
+    def test_wide_integer_keeps_precision(self):
+        """测试超出 64 位的整数不丢失精度，str 与 bytes 输入结果一致。"""
+        raw = '{"n": 123456789012345678901234567890, "m": 1}'
+
+        assert _loads(raw) == {"n": 123456789012345678901234567890, "m": 1}
+        assert _loads(raw.encode()) == _loads(raw)
+        assert _loads('{"m": 1}') == {"m": 1}
+        assert _loads('{"n": -9223372036854775809}') == {"n": -9223372036854775809}
+
+
+class FakeDatabase:
+    """记录语句顺序的内存数据库：SELECT 读取 / INSERT 写入 content，UPDATE 命中行数可配置。"""
+
+    def __init__(self, content=None, update_rowcount=0):
+        self.content = orjson.dumps(content) if content is not None else None
+        self.update_rowcount = update_rowcount
+        self.log = []
+
+    async def get_pool(self):
+        return self
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self._db = db
+
+    def cursor(self):
+        return FakeCursor(self._db)
+
+    async def begin(self):
+        self._db.log.append("BEGIN")
+
+    async def commit(self):
+        self._db.log.append("COMMIT")
+
+    async def rollback(self):
+        self._db.log.append("ROLLBACK")
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self._db = db
+        self._row = None
+        self.rowcount = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, sql, params=()):
+        verb = sql.split(None, 1)[0]
+        self._db.log.append(f"{verb} FOR UPDATE" if sql.endswith("FOR UPDATE") else verb)
+        if verb == "SELECT":
+            self._row = (self._db.content,) if self._db.content is not None else None
+        elif verb == "UPDATE":
+            self.rowcount = self._db.update_rowcount
+        elif verb == "INSERT":
+            self._db.content = params[1]
+            self.rowcount = 1
+
+    async def fetchone(self):
+        return self._row
+
+
+class TestPatchContent:
+    """patch_content 服务端 UPDATE / 事务回退路径测试。"""
+
+    DOC = {"type": "doc", "content": [{"type": "text", "text": "a"}]}
+
+    @pytest.mark.asyncio
+    async def test_server_side_update(self):
+        """测试服务端 UPDATE 命中时直接读回，不开启事务。"""
+        db = FakeDatabase(self.DOC, update_rowcount=1)
+        adapter = DocumentContentAdapter(db)
+
+        await adapter.patch_content(1, [{"op": "replace", "path": "/content/0/text", "value": "b"}])
+
+        assert db.log == ["UPDATE", "SELECT"]
+
+    @pytest.mark.asyncio
+    async def test_fallback_transaction(self):
+        """测试服务端 UPDATE 未命中时回退到事务内读取、应用并写回。"""
+        db = FakeDatabase(self.DOC, update_rowcount=0)
+        adapter = DocumentContentAdapter(db)
+
+        result = await adapter.patch_content(
+            1, [{"op": "replace", "path": "/content/0/text", "value": "b"}]
+        )
+
+        assert db.log == ["UPDATE", "BEGIN", "SELECT FOR UPDATE", "INSERT", "COMMIT"]
+        assert result["content"][0]["text"] == "b"
+        assert orjson.loads(db.content) == result
+
+    @pytest.mark.asyncio
+    async def test_failed_patch_rolls_back(self):
+        """测试 patch 应用失败时回滚且不写入。"""
+        db = FakeDatabase(self.DOC)
+        adapter = DocumentContentAdapter(db)
+
+        with pytest.raises(ValueError):
+            await adapter.patch_content(
+                1, [{"op": "test", "path": "/content/0/text", "value": "x"}]
+            )
+
+        assert db.log == ["BEGIN", "SELECT FOR UPDATE", "ROLLBACK"]
+        assert orjson.loads(db.content) == self.DOC
+
+    @pytest.mark.asyncio
+    async def test_empty_patch_reads_only(self):
+        """测试空 patch 只读取当前内容，不写入。"""
+        db = FakeDatabase(self.DOC)
+        adapter = DocumentContentAdapter(db)
+
+        assert await adapter.patch_content(1, []) == self.DOC
+        assert db.log == ["SELECT"]
+
+    @pytest.mark.asyncio
+    async def test_root_replace_writes_directly(self):
+        """测试根路径 replace/add 直接写入新值，非对象值抛出 ValueError。"""
+        db = FakeDatabase(self.DOC)
+        adapter = DocumentContentAdapter(db)
+        new_doc = {"type": "doc", "content": []}
+
+        result = await adapter.patch_content(1, [{"op": "add", "path": "", "value": new_doc}])
+
+        assert result == new_doc
+        assert db.log == ["INSERT"]
+        assert orjson.loads(db.content) == new_doc
+
+        with pytest.raises(ValueError):
+            await adapter.patch_content(1, [{"op": "replace", "path": "", "value": [1]}])
+        assert db.log == ["INSERT"]
+
+    @pytest.mark.asyncio
+    async def test_wide_integer_written_in_full(self):
+        """测试超出 64 位的整数经 Python 路径完整写入，已含此类整数的文档仍可 patch。"""
+        db = FakeDatabase(self.DOC, update_rowcount=1)
+        adapter = DocumentContentAdapter(db)
+
+        await adapter.patch_content(
+            1, [{"op": "replace", "path": "/content/0/text", "value": 2 ** 70}]
+        )
+        await adapter.patch_content(1, [{"op": "add", "path": "/content/-", "value": {}}])
+
+        assert db.log == [
+            "BEGIN", "SELECT FOR UPDATE", "INSERT", "COMMIT",
+            "BEGIN", "SELECT FOR UPDATE", "INSERT", "COMMIT",
+        ]
+        assert _loads(db.content)["content"] == [{"type": "text", "text": 2 ** 70}, {}]
@@ -189,6 +189,31 @@ class TestDictionaryEntry:
         with pytest.raises(ValueError, match="定义"):
             entry.validate()
 
+    def test_create_entry_defaults_editor(self):
+        """测试新建条目时编辑者与编辑时间默认与创建者一致。"""
+        entry = DictionaryEntry.create(
+            project_id=1,
+            term="ROI",
+            definition="投资回报率",
+            creator_id="u1",
+            creator_name="张三",
+        )
+
+        assert entry.id == 0
+        assert entry.editor_id == "u1"
+        assert entry.editor_name == "张三"
+        assert entry.edited_at == entry.created_at
+
+    def test_update_entry_returns_new_instance(self):
+        """测试更新条目返回新实例，原实例不变。"""
+        entry = DictionaryEntry.create(project_id=1, term="ROI", definition="投资回报率")
+        updated = entry.update(definition="新定义", editor_id="u2")
+
+        assert updated is not entry
+        assert updated.definition == "新定义"
+        assert updated.editor_id == "u2"
+        assert entry.definition == "投资回报率"
+
 
 class TestDocumentBlock:
     """文档块领域模型测试。"""
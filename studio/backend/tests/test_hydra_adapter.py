@@ -0,0 +1,135 @@
+"""
+Hydra 适配器单元测试
+"""
+import time
+
+import httpx
+import jwt
+import orjson
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.adapters.hydra_adapter import HydraAdapter
+from src.ports.hydra_port import IntrospectResponse
+from src.infrastructure.config.settings import Settings
+
+
+def _rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+class TestIntrospectOffline:
+    """JWT 离线验证测试。"""
+
+    @pytest.fixture
+    def signing_key(self):
+        return _rsa_key()
+
+    @pytest.fixture
+    def requests(self):
+        return []
+
+    @pytest.fixture
+    def adapter(self, mock_upstream, requests, signing_key):
+        jwk = orjson.loads(jwt.algorithms.RSAAlgorithm.to_jwk(signing_key.public_key()))
+        jwk.update({"kid": "k1", "alg": "RS256", "use": "sig"})
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=orjson.dumps({"keys": [jwk]}))
+
+        settings = Settings(hydra_offline_validation=True)
+        return mock_upstream(HydraAdapter, settings, handler, requests)
+
+    @staticmethod
+    def _token(key, kid="k1", **claims):
+        payload = {
+            "sub": "user-1",
+            "exp": int(time.time()) + 60,
+            "iss": Settings().hydra_issuer,
+            "client_id": "studio",
+            "scp": ["openid"],
+            **claims,
+        }
+        payload = {name: value for name, value in payload.items() if value is not None}
+        return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, adapter, requests, signing_key):
+        """测试签名有效的 JWT 离线通过，JWKS 只拉取一次。"""
+        token = self._token(signing_key, ext={"visitor_typ": "realname"})
+
+        first = await adapter.introspect_offline(token)
+        second = await adapter.introspect_offline(token)
+
+        assert first.active and first.visitor_id == "user-1"
+        assert first.visitor_typ == "realname"
+        assert second.active
+        assert len(requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_tokens(self, adapter, signing_key):
+        """测试签名不匹配或已过期的 JWT 判定为无效。"""
+        forged = self._token(_rsa_key())
+        expired = self._token(signing_key, exp=int(time.time()) - 60)
+
+        assert (await adapter.introspect_offline(forged)).active is False
+        assert (await adapter.introspect_offline(expired)).active is False
+
+    @pytest.mark.asyncio
+    async def test_id_token_and_wrong_issuer_rejected(self, adapter, signing_key):
+        """测试同一密钥签发的 ID Token 与签发者不符的 JWT 均判定为无效。"""
+        id_token = self._token(
+            signing_key, client_id=None, scp=None, aud=["studio"], at_hash="x"
+        )
+        wrong_issuer = self._token(signing_key, iss="http://evil.example/")
+
+        assert (await adapter.introspect_offline(id_token)).active is False
+        assert (await adapter.introspect_offline(wrong_issuer)).active is False
+
+    @pytest.mark.asyncio
+    async def test_fallback_cases(self, adapter, signing_key):
+        """测试不透明 token / 未知 kid / 未启用时返回 None（回退在线内省）。"""
+        assert await adapter.introspect_offline("ory_at_opaque") is None
+        assert await adapter.introspect_offline(self._token(signing_key, kid="k2")) is None
+
+        adapter._settings = Settings(hydra_offline_validation=False)
+        assert await adapter.introspect_offline(self._token(signing_key)) is None
+
+
+class TestIntrospectCache:
+    """在线内省缓存测试。"""
+
+    @pytest.fixture
+    def requests(self):
+        return []
+
+    @pytest.fixture
+    def adapter(self, mock_upstream, requests):
+        def handler(request: httpx.Request) -> httpx.Response:
+            active = b"token=bad" not in request.content
+            # token "expired" 在内省时刚好已过期（模拟内省后立即过期的 token）
+            offset = -1 if b"token=expired" in request.content else 3600
+            body = {"active": active, "sub": "user-1", "exp": int(time.time()) + offset}
+            return httpx.Response(200, content=orjson.dumps(body))
+
+        return mock_upstream(HydraAdapter, Settings(), handler, requests)
+
+    @pytest.mark.asyncio
+    async def test_active_and_inactive_cached(self, adapter, requests):
+        """测试有效与无效 token 的内省结果均被缓存，重复请求不再访问 Hydra。"""
+        for _ in range(3):
+            assert (await adapter.introspect("good")).active
+            assert not (await adapter.introspect("bad")).active
+
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_bounded_by_token_exp(self, adapter, requests):
+        """测试有效结果的缓存时间不超过 token 的 exp，已过期的 token 不写入缓存。"""
+        for _ in range(2):
+            assert (await adapter.introspect("expired")).active
+
+        assert len(requests) == 2
+        soon = IntrospectResponse(active=True, exp=1000)
+        assert adapter._active_ttu(b"", soon, 990) == 1000
+        assert adapter._active_ttu(b"", IntrospectResponse(active=True), 990) == 1020
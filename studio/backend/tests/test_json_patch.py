@@ -0,0 +1,99 @@
+"""
+JSON Patch（RFC 6902）单元测试
+"""
+import pytest
+
+from src.utils.json_patch import JsonPatchError, apply_patch, parse_pointer
+
+
+class TestParsePointer:
+    """JSON Pointer 解析测试。"""
+
+    def test_parse(self):
+        """测试解析普通指针与转义字符。"""
+        assert parse_pointer("") == ()
+        assert parse_pointer("/content/0/text") == ("content", "0", "text")
+        assert parse_pointer("/a~1b/c~0d") == ("a/b", "c~d")
+        assert parse_pointer("/") == ("",)
+
+    def test_invalid(self):
+        """测试无效指针。"""
+        with pytest.raises(JsonPatchError):
+            parse_pointer("content")
+        with pytest.raises(JsonPatchError):
+            parse_pointer("/a~2")
+
+
+class TestApplyPatch:
+    """JSON Patch 应用测试。"""
+
+    def test_add(self):
+        """测试 add 到对象成员与数组位置。"""
+        doc = {"content": [{"text": "a"}, {"text": "c"}]}
+        result = apply_patch(doc, [
+            {"op": "add", "path": "/content/1", "value": {"text": "b"}},
+            {"op": "add", "path": "/content/-", "value": {"text": "d"}},
+            {"op": "add", "path": "/type", "value": "doc"},
+        ])
+        assert result is doc
+        assert [n["text"] for n in doc["content"]] == ["a", "b", "c", "d"]
+        assert doc["type"] == "doc"
+
+    def test_remove_and_replace(self):
+        """测试 remove 与 replace。"""
+        doc = {"content": [{"text": "a"}, {"text": "b"}], "attrs": {"x": 1}}
+        apply_patch(doc, [
+            {"op": "remove", "path": "/content/0"},
+            {"op": "replace", "path": "/content/0/text", "value": "B"},
+            {"op": "remove", "path": "/attrs/x"},
+        ])
+        assert doc == {"content": [{"text": "B"}], "attrs": {}}
+
+    def test_move_and_copy(self):
+        """测试 move 与 copy（copy 后两处互不影响）。"""
+        doc = {"a": {"v": [1]}, "list": [1, 2, 3]}
+        apply_patch(doc, [
+            {"op": "copy", "from": "/a", "path": "/b"},
+            {"op": "move", "from": "/list/0", "path": "/list/-"},
+            {"op": "add", "path": "/b/v/-", "value": 2},
+        ])
+        assert doc == {"a": {"v": [1]}, "b": {"v": [1, 2]}, "list": [2, 3, 1]}
+
+    def test_copy_wide_integer(self):
+        """测试 copy 超出 64 位的整数时回退深拷贝，不丢失精度。"""
+        doc = {"a": {"n": 2 ** 70}}
+        apply_patch(doc, [{"op": "copy", "from": "/a", "path": "/b"}])
+        assert doc["b"] == {"n": 2 ** 70} and doc["b"] is not doc["a"]
+
+    def test_replace_root(self):
+        """测试替换整个文档。"""
+        assert apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": {"b": 2}}]) == {"b": 2}
+
+    def test_test_op(self):
+        """测试 test 操作。"""
+        doc = {"a": [1, 2]}
+        assert apply_patch(doc, [{"op": "test", "path": "/a", "value": [1, 2]}]) == doc
+        with pytest.raises(JsonPatchError):
+            apply_patch(doc, [{"op": "test", "path": "/a/0", "value": 2}])
+
+    @pytest.mark.parametrize("patch", [
+        [{"op": "replace", "path": "/missing", "value": 1}],
+        [{"op": "remove", "path": "/content/5"}],
+        [{"op": "add", "path": "/content/01", "value": 1}],
+        [{"op": "add", "path": "/missing/x", "value": 1}],
+        [{"op": "move", "from": "/content", "path": "/content/0"}],
+        [{"op": "add", "path": "/x"}],
+        [{"op": "unknown", "path": "/x"}],
+        [{"path": "/x"}],
+    ])
+    def test_invalid_patch(self, patch):
+        """测试无效操作抛出 JsonPatchError。"""
+        with pytest.raises(JsonPatchError):
+            apply_patch({"content": [{"text": "a"}]}, patch)
+
+    def test_invalid_patch_does_not_modify(self):
+        """测试格式无效的 patch 不会修改文档。"""
+        doc = {"a": 1}
+        with pytest.raises(JsonPatchError):
+            apply_patch(doc, [{"op": "add", "path": "/b", "value": 2}, {"op": "bad", "path": "/c"}])
+        assert doc == {"a": 1}
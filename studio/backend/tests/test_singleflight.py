@@ -0,0 +1,80 @@
+"""
+并发请求合并单元测试
+"""
+import asyncio
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlight 测试。"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """测试同一 key 的并发调用只执行一次并共享结果。"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return {"key": key}
+
+        results = await asyncio.gather(*(flight.do(1, fetch, 1) for _ in range(5)))
+
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """测试调用完成后再次调用会重新执行。"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(None)
+            return len(calls)
+
+        assert await flight.do("a", fetch) == 1
+        assert await flight.do("a", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_propagated(self):
+        """测试异常传递给所有等待方，且不残留进行中的调用。"""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_forget_starts_new_call(self):
+        """测试 forget 后的调用不复用进行中的旧调用。"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(None)
+            version = len(calls)
+            await release.wait()
+            return version
+
+        first = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        flight.forget("a")
+        second = asyncio.ensure_future(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == 1
+        assert await second == 2
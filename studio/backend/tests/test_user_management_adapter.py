@@ -0,0 +1,64 @@
+"""
+User Management 适配器单元测试
+"""
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from src.adapters.user_management_adapter import UserManagementAdapter
+from src.infrastructure.config.settings import Settings
+
+
+class TestBatchWindow:
+    """批处理窗口测试。"""
+
+    @pytest.fixture
+    def requests(self):
+        return []
+
+    @pytest.fixture
+    def adapter(self, mock_upstream, requests):
+        def handler(request: httpx.Request) -> httpx.Response:
+            user_ids = request.url.path.split("/")[-2].split(",")
+            body = [{"id": user_id} for user_id in user_ids]
+            return httpx.Response(200, content=orjson.dumps(body))
+
+        settings = Settings(user_management_batch_window=0.01)
+        return mock_upstream(UserManagementAdapter, settings, handler, requests)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_batched(self, adapter, requests):
+        """测试窗口内不同用户 ID 的并发查询合并为一次上游请求。"""
+        results = await asyncio.gather(
+            adapter.get_user_info_by_id("a"),
+            adapter.get_user_info_by_id("b"),
+            adapter.batch_get_user_info_by_id(["a", "c"]),
+        )
+
+        assert results[0].id == "a" and results[1].id == "b"
+        assert set(results[2]) == {"a", "c"}
+        assert len(requests) == 1
+        assert adapter._inflight == {} and adapter._flush_task is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_window_releases_waiters(self, adapter, requests):
+        """测试窗口任务被取消时，等待方收到取消而不是一直挂起。"""
+        waiter = asyncio.ensure_future(adapter.get_user_info_by_id("z"))
+        await asyncio.sleep(0)
+        adapter._flush_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert adapter._inflight == {} and requests == []
+
+    @pytest.mark.asyncio
+    async def test_unchanged_user_reuses_instance(self, adapter, requests):
+        """测试用户缓存过期后上游内容未变化时复用同一 UserInfo 实例。"""
+        first = await adapter.get_user_info_by_id("a")
+        adapter._user_cache.clear()
+        second = await adapter.get_user_info_by_id("a")
+
+        assert second is first
+        assert len(requests) == 2